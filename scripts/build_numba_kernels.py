@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Ahead-of-time compile the Numba kernels into src/_hvac_kernels.
+
+The kernel modules (src/data/_opportunity_kernel.py,
+src/control/_setback_kernel.py and src/viz/_daily_kernel.py) import this
+extension when it exists, so processes that use it pay no JIT compilation
+cost on first call and do not need LLVM at runtime. Without it they fall
+back to @njit, then to NumPy.
+
+Rebuild after changing a kernel loop:
+
+    python3 scripts/build_numba_kernels.py
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+import warnings
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.control._setback_kernel import _simulate_loop  # noqa: E402
+from src.data._opportunity_kernel import _opportunity_loop  # noqa: E402
+from src.viz._daily_kernel import _daily_opportunity_loop  # noqa: E402
+
+MODULE_NAME = "_hvac_kernels"
+
+# Export name -> (signature, Python loop). The loops are the same functions the
+# JIT path compiles, so both paths stay in sync.
+EXPORTS = {
+    "opportunity_f8": ("Tuple((b1[:], f8[:], f8))(f8[:], b1[:], f8[:])", _opportunity_loop),
+    "opportunity_f4": ("Tuple((b1[:], f4[:], f8))(f4[:], b1[:], f4[:])", _opportunity_loop),
+    "simulate_setback": (
+        "Tuple((f8[:], f8[:], f8[:], b1[:]))"
+        "(f8[:], i8[:], b1[:], f8[:], f8[:], f8[:], f8[:], i8, f8, f8, f8, f8)",
+        _simulate_loop,
+    ),
+    "daily_opportunity_sum": (
+        "Tuple((f8[:], f8[:]))(i8[:], f8[:], f8[:], f8, i8)",
+        _daily_opportunity_loop,
+    ),
+    # Narrowed dashboard frames: uint8/uint16 or float32 counts, float32 power.
+    "daily_opportunity_sum_u1f4": (
+        "Tuple((f8[:], f8[:]))(i8[:], u1[:], f4[:], f8, i8)",
+        _daily_opportunity_loop,
+    ),
+    "daily_opportunity_sum_u2f4": (
+        "Tuple((f8[:], f8[:]))(i8[:], u2[:], f4[:], f8, i8)",
+        _daily_opportunity_loop,
+    ),
+    "daily_opportunity_sum_f4": (
+        "Tuple((f8[:], f8[:]))(i8[:], f4[:], f4[:], f8, i8)",
+        _daily_opportunity_loop,
+    ),
+}
+
+
+def build(output_dir: Path, verbose: bool = False) -> None:
+    with warnings.catch_warnings():
+        # numba.pycc is deprecated upstream but still the only AOT path.
+        warnings.simplefilter("ignore")
+        from numba.pycc import CC
+
+    cc = CC(MODULE_NAME)
+    cc.output_dir = str(output_dir)
+    cc.verbose = verbose
+    for name, (signature, func) in EXPORTS.items():
+        cc.export(name, signature)(func)
+    cc.compile()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output-dir", type=Path, default=PROJECT_ROOT / "src")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    build(args.output_dir, verbose=args.verbose)
+    print(f"Built {MODULE_NAME} in {args.output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,6 @@
+"""Compiler flags shared by the Numba kernels in src.data, src.control and src.viz."""
+
+# fastmath without the no-NaN/no-Inf assumptions ("nnan", "ninf"): occupancy,
+# power and setpoint columns may be missing, and under those flags comparisons
+# and sums involving NaN are undefined.
+FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
@@ -0,0 +1,146 @@
+"""
+Sequential occupancy-setback simulator over flat NumPy arrays.
+
+Rows must be sorted by (group, time). Setback can only be applied once the
+next occupied step is far enough away to leave room for pre-conditioning, so
+the simulator first builds a "steps to next occupancy" array in one
+right-to-left pass and then walks the rows forward. With Numba installed
+both passes are compiled; otherwise an equivalent vectorized NumPy version
+is used. Set HVAC_NUMBA_WARMUP=1 to compile at import time. If the
+ahead-of-time extension built by scripts/build_numba_kernels.py is present
+it is used instead and no JIT compilation happens.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - depends on runtime environment
+    njit = None
+
+from src._numba_flags import FASTMATH
+
+try:
+    from src import _hvac_kernels
+except ImportError:  # pragma: no cover - built by scripts/build_numba_kernels.py
+    _hvac_kernels = None
+
+
+def _steps_to_next_occupancy_numpy(
+    occ: np.ndarray, group: np.ndarray, thresh: float
+) -> np.ndarray:
+    n = occ.shape[0]
+    idx = np.arange(n)
+    next_idx = np.minimum.accumulate(np.where(occ > thresh, idx, n)[::-1])[::-1]
+    bounds = np.r_[0, np.flatnonzero(np.diff(group)) + 1, n]
+    group_end = np.repeat(bounds[1:], np.diff(bounds))
+    return np.where(next_idx < group_end, next_idx - idx, n + 1)
+
+
+def _simulate_numpy(
+    occ, group, hvac_on, sp, eng, rate, setback_delta, precond_steps, thresh,
+    savings_fraction, min_temp, max_temp,
+):
+    steps = _steps_to_next_occupancy_numpy(occ, group, thresh)
+    setback = hvac_on & (steps > precond_steps)
+    sp_out = np.where(setback, np.clip(sp + setback_delta, min_temp, max_temp), sp)
+    eng_out = np.where(setback, eng * (1.0 - savings_fraction), eng)
+    return sp_out, eng_out, eng_out * rate, setback
+
+
+def _simulate_loop(  # pragma: no cover - compiled
+    occ, group, hvac_on, sp, eng, rate, setback_delta, precond_steps, thresh,
+    savings_fraction, min_temp, max_temp,
+):
+    n = occ.shape[0]
+    none_ahead = n + 1
+    steps = np.empty(n, dtype=np.int64)
+    nxt = none_ahead
+    for i in range(n - 1, -1, -1):
+        if i == n - 1 or group[i] != group[i + 1]:
+            nxt = none_ahead
+        if occ[i] > thresh:
+            nxt = 0
+        elif nxt < none_ahead:
+            nxt += 1
+        steps[i] = nxt
+
+    sp_out = np.empty(n, dtype=np.float64)
+    eng_out = np.empty(n, dtype=np.float64)
+    cost_out = np.empty(n, dtype=np.float64)
+    setback = np.empty(n, dtype=np.bool_)
+    for i in range(n):
+        if hvac_on[i] and steps[i] > precond_steps:
+            sp_out[i] = min(max(sp[i] + setback_delta[i], min_temp), max_temp)
+            eng_out[i] = eng[i] * (1.0 - savings_fraction)
+            setback[i] = True
+        else:
+            sp_out[i] = sp[i]
+            eng_out[i] = eng[i]
+            setback[i] = False
+        cost_out[i] = eng_out[i] * rate[i]
+    return sp_out, eng_out, cost_out, setback
+
+
+if njit is not None:
+    _simulate_numba = njit(cache=True, fastmath=FASTMATH)(_simulate_loop)
+else:
+    _simulate_numba = None
+
+
+def simulate_occupancy_setback(
+    occ: np.ndarray,
+    group: np.ndarray,
+    hvac_on: np.ndarray,
+    sp: np.ndarray,
+    eng: np.ndarray,
+    rate: np.ndarray,
+    setback_delta: np.ndarray,
+    precond_steps: int,
+    thresh: float,
+    savings_fraction: float,
+    min_temp: float,
+    max_temp: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Return (setpoint, energy, cost, is_setback) arrays for the setback policy.
+
+    A step is set back when its HVAC is on, it is unoccupied (occ <= thresh)
+    and the next occupied step of its group is more than `precond_steps` away; its setpoint
+    moves by its row of `setback_delta` (signed, clipped to [min_temp,
+    max_temp]) and its energy drops by `savings_fraction`.
+    """
+    args = (
+        np.ascontiguousarray(occ, dtype=np.float64),
+        np.ascontiguousarray(group, dtype=np.int64),
+        np.ascontiguousarray(hvac_on, dtype=np.bool_),
+        np.ascontiguousarray(sp, dtype=np.float64),
+        np.ascontiguousarray(eng, dtype=np.float64),
+        np.ascontiguousarray(rate, dtype=np.float64),
+        np.ascontiguousarray(setback_delta, dtype=np.float64),
+        int(precond_steps),
+        float(thresh),
+        float(savings_fraction),
+        float(min_temp),
+        float(max_temp),
+    )
+    if _hvac_kernels is not None:
+        return _hvac_kernels.simulate_setback(*args)
+    if _simulate_numba is None:
+        return _simulate_numpy(*args)
+    return _simulate_numba(*args)
+
+
+def warmup() -> None:
+    """Compile the Numba kernel on a tiny input so later calls skip JIT cost."""
+    one = np.zeros(1)
+    simulate_occupancy_setback(one, one, one > 0, one, one, one, one, 0, 0.0, 0.0, 0.0, 1.0)
+
+
+if os.environ.get("HVAC_NUMBA_WARMUP") == "1":  # pragma: no cover - opt-in
+    warmup()
@@ -11,6 +11,10 @@ import pandas as pd
 import numpy as np
 from typing import Optional, Dict, Tuple, Any
 
+from src.data import calendar_features, tou_rate_table
+
+from ._setback_kernel import _steps_to_next_occupancy_numpy, simulate_occupancy_setback
+
 
 def compute_savings_and_setpoints(
     occupancy_forecast: pd.DataFrame,
@@ -37,45 +41,181 @@ def compute_savings_and_setpoints(
             Expected columns: [timestamp, zone_id, predicted_occupancy]
         hvac_baseline: DataFrame with baseline HVAC operation.
             Expected columns: [timestamp, zone_id, baseline_setpoint, baseline_energy]
+            Optional columns: hvac_on (defaults to baseline_energy > 0) and
+            hvac_mode ("heating"/"cooling", overrides constraint `mode`).
+            zone_id must be present in both frames or in neither.
         tou_rates: Optional DataFrame with time-of-use electricity rates.
-            Expected columns: [timestamp or hour, rate_kwh]
+            Expected columns: [timestamp or hour, rate_kwh], or hour-of-day
+            windows [start_hour, end_hour, rate_kwh] as used by add_tou_features
         comfort_constraints: Optional dict specifying:
             - min_temp: Minimum allowed temperature (heating setback limit)
             - max_temp: Maximum allowed temperature (cooling setback limit)
             - pre_condition_time: Minutes to pre-heat/cool before expected occupancy
-            - occupancy_threshold: Below this count, consider "unoccupied"
+            - occupancy_threshold: At or below this count, consider "unoccupied"
+            - setback_delta: °F setback magnitude (lowered when heating,
+              raised when cooling)
+            - savings_fraction: Share of baseline energy saved while set back
+            - mode: "heating" or "cooling" when no hvac_mode column is given
+            - freq: Sampling interval of the data
+            Missing keys fall back to the defaults below.
 
     Returns:
         Tuple of:
         - DataFrame with recommended setpoints and savings per timestep
         - Dict with summary metrics (total_energy_savings, total_cost_savings, etc.)
 
+    The setback decision is evaluated with masked float32 array arithmetic
+    over all rows at once rather than row by row.
+
     TODO:
-        - Implement setpoint optimization algorithm
-        - Handle heating vs cooling seasons differently
-        - Add pre-conditioning logic (ramp up before occupancy returns)
         - Integrate building thermal model for more accurate savings estimates
         - Consider zone interactions (adjacent zones affect each other)
         - Add uncertainty handling from occupancy forecast
     """
-    if comfort_constraints is None:
-        comfort_constraints = {
-            "min_temp": 60,  # °F - heating setback limit
-            "max_temp": 85,  # °F - cooling setback limit
-            "pre_condition_time": 30,  # minutes
-            "occupancy_threshold": 0,  # zero occupancy = unoccupied
-        }
-
-    # TODO: Implement optimization logic
-    # 1. Identify unoccupied periods from forecast
-    # 2. For each unoccupied period, compute potential setback
-    # 3. Account for pre-conditioning needs
-    # 4. Estimate energy savings per period
-    # 5. Apply TOU rates for cost savings
-
-    raise NotImplementedError(
-        "Implement setpoint optimization and savings calculation"
+    constraints: Dict[str, Any] = {
+        "min_temp": 60,  # °F - heating setback limit
+        "max_temp": 85,  # °F - cooling setback limit
+        "pre_condition_time": 30,  # minutes
+        "occupancy_threshold": 0,  # zero occupancy = unoccupied
+        "setback_delta": 4.0,  # °F magnitude; sign follows the season
+        "savings_fraction": 0.3,  # share of baseline energy saved while set back
+        "mode": "cooling",  # used when hvac_baseline has no hvac_mode column
+        "freq": "15min",
+    }
+    constraints.update(comfort_constraints or {})
+
+    for frame, cols in [
+        (occupancy_forecast, ["timestamp", "predicted_occupancy"]),
+        (hvac_baseline, ["timestamp", "baseline_setpoint", "baseline_energy"]),
+    ]:
+        for col in cols:
+            if col not in frame.columns:
+                raise ValueError(f"Missing required column: {col}")
+
+    has_zone = ["zone_id" in frame.columns for frame in (occupancy_forecast, hvac_baseline)]
+    if has_zone[0] != has_zone[1]:
+        # A timestamp-only merge would copy each row into every zone and
+        # interleave the zones' series.
+        raise ValueError(
+            "occupancy_forecast and hvac_baseline must both have 'zone_id' or neither"
+        )
+    keys = ["zone_id", "timestamp"] if has_zone[0] else ["timestamp"]
+    df = occupancy_forecast[keys + ["predicted_occupancy"]].merge(
+        hvac_baseline, on=keys, how="inner"
     )
+    df = df.sort_values(keys, kind="stable").reset_index(drop=True)
+    n = len(df)
+
+    def values(col: str, fill: float) -> np.ndarray:
+        return np.nan_to_num(
+            pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float32), nan=fill
+        )
+
+    # A missing forecast counts as occupied so it never triggers a setback.
+    occ = values("predicted_occupancy", np.inf)
+    baseline_sp = pd.to_numeric(df["baseline_setpoint"], errors="coerce").to_numpy(
+        dtype=np.float32
+    )
+    baseline_energy = values("baseline_energy", 0.0)
+    hvac_on = _hvac_on(df, "hvac_on", baseline_energy)
+    is_heating = _is_heating(df, constraints["mode"])
+
+    group = pd.factorize(df["zone_id"])[0] if "zone_id" in keys else np.zeros(n, dtype=np.int64)
+    step = pd.Timedelta(constraints["freq"])
+    precond_steps = int(np.ceil(pd.Timedelta(minutes=constraints["pre_condition_time"]) / step))
+    thresh = np.float32(constraints["occupancy_threshold"])
+    steps_to_occupied = _steps_to_next_occupancy_numpy(occ, group, thresh)
+
+    mask = (occ <= thresh) & hvac_on & (steps_to_occupied > precond_steps)
+    magnitude = np.float32(abs(constraints["setback_delta"]))
+    delta = np.where(is_heating, -magnitude, magnitude)
+    setpoint = np.where(
+        mask,
+        np.clip(
+            baseline_sp + delta,
+            np.float32(constraints["min_temp"]),
+            np.float32(constraints["max_temp"]),
+        ),
+        baseline_sp,
+    )
+    energy_saved = mask * baseline_energy * np.float32(constraints["savings_fraction"])
+
+    out = df.assign(
+        recommended_setpoint=setpoint,
+        is_setback=mask,
+        energy_savings_kwh=energy_saved,
+    )
+    total_baseline = float(baseline_energy.sum(dtype=np.float64))
+    total_saved = float(energy_saved.sum(dtype=np.float64))
+    summary: Dict[str, float] = {
+        "baseline_energy_kwh": total_baseline,
+        "total_energy_savings": total_saved,
+        "energy_savings_pct": 100.0 * total_saved / total_baseline if total_baseline else 0.0,
+        "setback_hours": float(mask.sum() * step / pd.Timedelta(hours=1)),
+    }
+    if tou_rates is not None:
+        rate = _lookup_tou_rates(df["timestamp"], tou_rates)
+        cost_saved = energy_saved * np.nan_to_num(rate)
+        out["tou_rate"] = rate
+        out["cost_savings"] = cost_saved
+        summary["total_cost_savings"] = float(cost_saved.sum(dtype=np.float64))
+    return out, summary
+
+
+def _hvac_on(df: pd.DataFrame, col: str, energy: np.ndarray) -> np.ndarray:
+    """Per-row HVAC state from `col`, else inferred as `energy > 0`."""
+    if col in df.columns:
+        return df[col].fillna(False).to_numpy(dtype=bool)
+    return energy > 0
+
+
+def _is_heating(df: pd.DataFrame, mode: str) -> np.ndarray:
+    """
+    Per-row heating flag from an `hvac_mode` column, else from `mode`.
+
+    Both setback policies treat `setback_delta` as a magnitude: the setpoint
+    is lowered on heating rows and raised on cooling rows.
+    """
+    if "hvac_mode" in df.columns:
+        return df["hvac_mode"].astype(str).str.lower().str.startswith("heat").to_numpy()
+    return np.full(len(df), str(mode).lower().startswith("heat"))
+
+
+def _lookup_tou_rates(timestamps: pd.Series, tou_rates: pd.DataFrame) -> np.ndarray:
+    """
+    Return a float32 rate per timestamp from a TOU table given either as
+    hour-of-day windows (start_hour, end_hour, rate_kwh), per-hour rates
+    (hour, rate_kwh) or a rate time series (timestamp, rate_kwh).
+    """
+    if "rate_kwh" not in tou_rates.columns:
+        raise ValueError("TOU rates must contain 'rate_kwh'")
+    ts = pd.to_datetime(timestamps, errors="coerce")
+    if "timestamp" in tou_rates.columns and "hour" not in tou_rates.columns:
+        rates = tou_rates[["timestamp", "rate_kwh"]].dropna(subset=["timestamp"])
+        rates = rates.assign(timestamp=pd.to_datetime(rates["timestamp"]).dt.as_unit("ns"))
+        rates = rates.sort_values("timestamp", kind="stable")
+        valid = ts.notna().to_numpy()
+        out = np.full(len(ts), np.nan, dtype=np.float32)
+        left = pd.DataFrame({"timestamp": ts[valid].dt.as_unit("ns").to_numpy()})
+        if valid.any():
+            order = np.argsort(left["timestamp"].to_numpy(), kind="stable")
+            matched = pd.merge_asof(left.iloc[order], rates, on="timestamp")
+            out[np.flatnonzero(valid)[order]] = matched["rate_kwh"].to_numpy(dtype=np.float32)
+        return out
+
+    if "hour" in tou_rates.columns:
+        hour = tou_rates["hour"].astype(int)
+        tou_rates = tou_rates.assign(start_hour=hour, end_hour=hour + 1)
+    table = tou_rate_table(tou_rates)
+    out = np.full(len(ts), np.nan, dtype=np.float32)
+    valid = ts.notna().to_numpy()
+    if valid.any():
+        calendar = calendar_features(ts[valid])
+        out[valid] = table[
+            np.asarray(calendar["day_of_week"], dtype=np.intp),
+            np.asarray(calendar["hour"], dtype=np.intp),
+        ]
+    return out
 
 
 def estimate_savings_potential(
@@ -131,7 +271,13 @@ def simulate_control_policy(
     Simulate a control policy on historical data.
 
     Runs a what-if analysis to estimate savings if a particular
-    control strategy had been applied to historical data.
+    control strategy had been applied to historical data. The setback
+    policies walk each zone's series in time order with a compiled state
+    machine (see `_setback_kernel`): a step is set back only when the HVAC is
+    on, the zone is unoccupied and the next occupancy is beyond the
+    pre-conditioning window.
+    As in `compute_savings_and_setpoints`, missing occupancy counts as
+    occupied, and an optional `hvac_mode` column sets the setback direction.
 
     Args:
         historical_df: Historical occupancy + HVAC data.
@@ -139,7 +285,20 @@ def simulate_control_policy(
             - "occupancy_setback": Simple setback when unoccupied
             - "predictive_setback": Use predicted occupancy for setback
             - "optimal_schedule": Pre-computed optimal schedule
-        policy_params: Parameters specific to the chosen policy.
+        policy_params: Parameters specific to the chosen policy:
+            - occupancy_col: Defaults to "occupancy_count" (or
+              "predicted_occupancy" for predictive_setback)
+            - setpoint_col, energy_col, tou_rate_col: Input column names
+            - hvac_on_col: HVAC state column (defaults to energy > 0 when
+              absent); steps with the HVAC off are never set back
+            - setback_delta: °F setback magnitude (lowered when heating,
+              raised when cooling)
+            - mode: "heating" or "cooling" when no hvac_mode column is given
+            - pre_condition_time: Minutes to restore baseline before occupancy
+            - occupancy_threshold: At or below this count, consider "unoccupied"
+            - savings_fraction: Share of baseline energy saved while set back
+            - min_temp, max_temp: Setpoint limits
+            - freq: Sampling interval of the data
 
     Returns:
         Tuple of:
@@ -147,14 +306,95 @@ def simulate_control_policy(
         - Dict with simulation summary metrics
 
     TODO:
-        - Implement multiple control policies
+        - Implement optimal_schedule policy
         - Add thermal comfort metrics to output
-        - Compare policies against baseline
         - Add Monte Carlo simulation for uncertainty
     """
     valid_policies = ["occupancy_setback", "predictive_setback", "optimal_schedule"]
     if policy not in valid_policies:
         raise ValueError(f"Policy must be one of {valid_policies}")
+    if policy == "optimal_schedule":
+        raise NotImplementedError("Implement optimal_schedule policy simulation")
+
+    params: Dict[str, Any] = {
+        "occupancy_col": (
+            "predicted_occupancy" if policy == "predictive_setback" else "occupancy_count"
+        ),
+        "setpoint_col": "baseline_setpoint",
+        "energy_col": "energy_kwh",
+        "tou_rate_col": "tou_rate",
+        "hvac_on_col": "hvac_on",
+        "setback_delta": 4.0,  # °F magnitude; sign follows the season
+        "mode": "cooling",  # used when historical_df has no hvac_mode column
+        "pre_condition_time": 30,
+        "occupancy_threshold": 0,
+        "savings_fraction": 0.3,
+        "min_temp": 60,
+        "max_temp": 85,
+        "freq": "15min",
+    }
+    params.update(policy_params or {})
+
+    occ_col = params["occupancy_col"]
+    energy_col = params["energy_col"]
+    for col in ["timestamp", occ_col, energy_col]:
+        if col not in historical_df.columns:
+            raise ValueError(f"Missing required column: {col}")
+
+    sort_cols = ["zone_id", "timestamp"] if "zone_id" in historical_df.columns else ["timestamp"]
+    df = historical_df.sort_values(sort_cols, kind="stable").reset_index(drop=True)
+    if "zone_id" in df.columns:
+        group = pd.factorize(df["zone_id"])[0]
+    else:
+        group = np.zeros(len(df), dtype=np.int64)
+
+    def column_or(col: str, fill: float) -> np.ndarray:
+        if col in df.columns:
+            return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+        return np.full(len(df), fill)
+
+    step = pd.Timedelta(params["freq"])
+    precond_steps = int(np.ceil(pd.Timedelta(minutes=params["pre_condition_time"]) / step))
+    has_rates = params["tou_rate_col"] in df.columns
+    energy = np.nan_to_num(column_or(energy_col, 0.0))
+    rate = np.nan_to_num(column_or(params["tou_rate_col"], 0.0))
+
+    magnitude = abs(float(params["setback_delta"]))
+    # A missing occupancy value counts as occupied so it never triggers a setback.
+    setpoint, sim_energy, sim_cost, is_setback = simulate_occupancy_setback(
+        occ=np.nan_to_num(column_or(occ_col, 0.0), nan=np.inf),
+        group=group,
+        hvac_on=_hvac_on(df, params["hvac_on_col"], energy),
+        sp=column_or(params["setpoint_col"], np.nan),
+        eng=energy,
+        rate=rate,
+        setback_delta=np.where(_is_heating(df, params["mode"]), -magnitude, magnitude),
+        precond_steps=precond_steps,
+        thresh=params["occupancy_threshold"],
+        savings_fraction=params["savings_fraction"],
+        min_temp=params["min_temp"],
+        max_temp=params["max_temp"],
+    )
+    out = df.assign(
+        simulated_setpoint=setpoint,
+        simulated_energy_kwh=sim_energy,
+        is_setback=is_setback,
+    )
 
-    # TODO: Implement policy simulation
-    raise NotImplementedError("Implement control policy simulation")
+    baseline_energy = float(energy.sum())
+    simulated_energy = float(sim_energy.sum())
+    summary = {
+        "baseline_energy_kwh": baseline_energy,
+        "simulated_energy_kwh": simulated_energy,
+        "energy_savings_kwh": baseline_energy - simulated_energy,
+        "energy_savings_pct": (
+            100.0 * (baseline_energy - simulated_energy) / baseline_energy
+            if baseline_energy
+            else 0.0
+        ),
+        "setback_hours": float(is_setback.sum() * step / pd.Timedelta(hours=1)),
+    }
+    if has_rates:
+        out["simulated_cost"] = sim_cost
+        summary["cost_savings"] = float((energy * rate).sum() - sim_cost.sum())
+    return out, summary
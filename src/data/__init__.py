@@ -17,11 +17,17 @@ from .load import (
     load_weather_from_db,
 )
 from .preprocess import (
+    MergedArrays,
+    add_zone_proximity_features,
+    calendar_features,
     engineer_features,
     merge_occupancy_hvac,
+    merge_occupancy_hvac_arrays,
     normalize_occupancy,
     normalize_weather,
     prepare_occupancy_forecast_dataset,
+    tou_rate_table,
+    zone_distance_matrix,
 )
 
 __all__ = [
@@ -40,8 +46,14 @@ __all__ = [
     "load_tou_from_db",
     "load_space_metadata_from_db",
     "merge_occupancy_hvac",
+    "merge_occupancy_hvac_arrays",
+    "MergedArrays",
     "engineer_features",
     "normalize_occupancy",
     "normalize_weather",
     "prepare_occupancy_forecast_dataset",
+    "zone_distance_matrix",
+    "add_zone_proximity_features",
+    "calendar_features",
+    "tou_rate_table",
 ]
@@ -0,0 +1,130 @@
+"""
+Fused kernel for the "opportunity for savings" mask and energy reduction.
+
+Numba is optional: when it is installed the mask, per-row savings and total
+are produced in one parallel pass; otherwise a vectorized NumPy version with
+the same signature is used. Set HVAC_NUMBA_WARMUP=1 to compile at import time
+instead of on the first call. If the ahead-of-time extension built by
+scripts/build_numba_kernels.py is present, contiguous float32/float64 inputs
+use it and skip JIT compilation entirely.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # pragma: no cover - depends on runtime environment
+    njit = None
+    prange = range
+
+from src._numba_flags import FASTMATH
+
+try:
+    from src import _hvac_kernels
+except ImportError:  # pragma: no cover - built by scripts/build_numba_kernels.py
+    _hvac_kernels = None
+
+
+def _opportunity_numpy(
+    occ: np.ndarray,
+    hvac_on: np.ndarray,
+    energy: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, float]:
+    mask = (occ <= 0) & hvac_on
+    savings = np.where(mask, energy, 0.0)
+    return mask, savings, float(savings.sum())
+
+
+def _opportunity_loop(occ, hvac_on, energy):  # pragma: no cover - compiled
+    n = occ.shape[0]
+    mask = np.empty(n, dtype=np.bool_)
+    savings = np.empty_like(energy)
+    total = 0.0
+    for i in prange(n):
+        m = occ[i] <= 0 and hvac_on[i]
+        e = energy[i] if m else 0.0
+        mask[i] = m
+        savings[i] = e
+        total += e
+    return mask, savings, total
+
+
+# (occ, energy) dtype -> AOT export name; see scripts/build_numba_kernels.py.
+_AOT_OPPORTUNITY = {
+    (np.dtype(np.float64), np.dtype(np.float64)): "opportunity_f8",
+    (np.dtype(np.float32), np.dtype(np.float32)): "opportunity_f4",
+}
+
+if njit is not None:
+    _opportunity_numba = njit(parallel=True, cache=True, fastmath=FASTMATH)(_opportunity_loop)
+else:
+    _opportunity_numba = None
+
+
+def opportunity(
+    occ: np.ndarray,
+    hvac_on: np.ndarray,
+    energy: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Return (is_opportunity, potential_energy_savings, total_savings).
+
+    A row is an opportunity when occupancy <= 0 while HVAC is on; its savings
+    equal its energy, otherwise 0. Float inputs keep their dtype, so float32
+    arrays are not widened.
+    """
+    occ = np.ascontiguousarray(occ)
+    hvac_on = np.ascontiguousarray(hvac_on, dtype=np.bool_)
+    energy = np.ascontiguousarray(energy)
+    if energy.dtype.kind != "f":
+        energy = energy.astype(np.float64)
+    aot_name = _AOT_OPPORTUNITY.get((occ.dtype, energy.dtype))
+    if _hvac_kernels is not None and aot_name is not None:
+        mask, savings, total = getattr(_hvac_kernels, aot_name)(occ, hvac_on, energy)
+        return mask, savings, float(total)
+    if _opportunity_numba is None:
+        return _opportunity_numpy(occ, hvac_on, energy)
+    mask, savings, total = _opportunity_numba(occ, hvac_on, energy)
+    return mask, savings, float(total)
+
+
+def opportunity_from_arrays(merged) -> Tuple[np.ndarray, np.ndarray, float]:
+    """Run `opportunity` directly on a `MergedArrays` bundle."""
+    return opportunity(merged.occupancy, merged.hvac_on, merged.energy)
+
+
+def opportunity_bits(
+    occ: np.ndarray,
+    hvac_on_bits: np.ndarray,
+    energy: np.ndarray,
+) -> Tuple[np.ndarray, float]:
+    """
+    Return (is_opportunity bitmap, total_savings) for a packed HVAC bitmap.
+
+    The mask is combined 8 rows per byte and only unpacked as a uint8 weight
+    vector for the energy dot product, so no per-row bool column is kept.
+    """
+    n = len(occ)
+    opportunity_packed = np.packbits(np.asarray(occ) <= 0) & hvac_on_bits
+    weights = np.unpackbits(opportunity_packed, count=n)
+    total = np.einsum("i,i->", weights, np.asarray(energy), dtype=np.float64)
+    return opportunity_packed, float(total)
+
+
+def opportunity_bits_from_arrays(merged) -> Tuple[np.ndarray, float]:
+    """Run `opportunity_bits` directly on a `MergedArrays` bundle."""
+    return opportunity_bits(merged.occupancy, merged.hvac_on_bits, merged.energy)
+
+
+def warmup() -> None:
+    """Compile the Numba kernel on a tiny input so later calls skip JIT cost."""
+    opportunity(np.zeros(1), np.ones(1, dtype=np.bool_), np.zeros(1))
+
+
+if os.environ.get("HVAC_NUMBA_WARMUP") == "1":  # pragma: no cover - opt-in
+    warmup()
@@ -328,13 +328,15 @@ def load_hvac_from_db(
     table_name: str = "hvac",
     schema: str = "public",
     env_path: str = ".env",
+    columns: Optional[Sequence[str]] = None,
 ) -> pd.DataFrame:
     """
-    Load HVAC table from PostgreSQL.
+    Load HVAC table from PostgreSQL, optionally selecting only `columns`.
     """
     return load_table_from_db(
         table_name=table_name,
         schema=schema,
+        columns=columns,
         env_path=env_path,
         parse_dates=["timestamp"],
     )
@@ -344,13 +346,15 @@ def load_tou_from_db(
     table_name: str,
     schema: str = "public",
     env_path: str = ".env",
+    columns: Optional[Sequence[str]] = None,
 ) -> pd.DataFrame:
     """
-    Load TOU table from PostgreSQL.
+    Load TOU table from PostgreSQL, optionally selecting only `columns`.
     """
     return load_table_from_db(
         table_name=table_name,
         schema=schema,
+        columns=columns,
         env_path=env_path,
     )
 
@@ -359,12 +363,14 @@ def load_space_metadata_from_db(
     table_name: str = "space_metadata",
     schema: str = "public",
     env_path: str = ".env",
+    columns: Optional[Sequence[str]] = None,
 ) -> pd.DataFrame:
     """
-    Load space metadata table from PostgreSQL.
+    Load space metadata table from PostgreSQL, optionally selecting only `columns`.
     """
     return load_table_from_db(
         table_name=table_name,
         schema=schema,
+        columns=columns,
         env_path=env_path,
     )
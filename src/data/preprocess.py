@@ -5,13 +5,19 @@ Data preprocessing and feature engineering for HVAC occupancy forecasting.
 from __future__ import annotations
 
 import logging
-from typing import List, Optional, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
 
+from ._opportunity_kernel import opportunity
+
 LOGGER = logging.getLogger(__name__)
 DEFAULT_LAG_PERIODS = [1, 4, 96]
+_NS_PER_HOUR = 3_600_000_000_000
+_NS_PER_DAY = 86_400_000_000_000
 
 
 def _pick_column(columns: Sequence[str], candidates: Sequence[str], label: str) -> str:
@@ -21,6 +27,35 @@ def _pick_column(columns: Sequence[str], candidates: Sequence[str], label: str)
     raise ValueError(f"Could not find {label} column. Tried: {list(candidates)}")
 
 
+def calendar_features(ts: pd.Series) -> dict:
+    """
+    Derive hour/day_of_week/is_weekend/month from one read of the timestamps.
+
+    Hour and weekday come from integer arithmetic on the nanosecond epoch
+    (1970-01-01 was a Thursday); only month goes through DatetimeIndex.
+    """
+    if ts.dt.tz is not None:
+        ts = ts.dt.tz_localize(None)
+    if ts.isna().any():
+        return {
+            "hour": ts.dt.hour,
+            "day_of_week": ts.dt.dayofweek,
+            "is_weekend": ts.dt.dayofweek.isin([5, 6]).astype(int),
+            "month": ts.dt.month,
+        }
+
+    ns = ts.to_numpy(dtype="datetime64[ns]").view("i8")
+    hour = (ns // _NS_PER_HOUR) % 24
+    dow = (ns // _NS_PER_DAY + 3) % 7
+    month = pd.DatetimeIndex(ts).month.to_numpy()
+    return {
+        "hour": hour.astype(np.int8),
+        "day_of_week": dow.astype(np.int8),
+        "is_weekend": (dow >= 5).astype(np.int8),
+        "month": month.astype(np.int8),
+    }
+
+
 def normalize_occupancy(
     occ_df: pd.DataFrame,
     zone_id: Optional[str] = None,
@@ -178,14 +213,18 @@ def prepare_occupancy_forecast_dataset(
     return occ.reset_index()
 
 
-def merge_occupancy_hvac(
+def _merge_occupancy_hvac_coded(
     occ_df: pd.DataFrame,
     hvac_df: pd.DataFrame,
-    freq: str = "15min",
-    how: str = "inner",
-) -> pd.DataFrame:
+    freq: str,
+    how: str,
+) -> Tuple[pd.DataFrame, pd.Index]:
     """
-    Merge occupancy and HVAC data on timestamp and zone identifier.
+    Merge occupancy and HVAC with zone_id as int32 codes into a shared codebook.
+
+    Both sides are factorized against the sorted union of their zone labels,
+    so grouping and joining hash 4-byte integers instead of strings; the
+    sorted codebook keeps row order identical to sorting on the labels.
     """
     occ = normalize_occupancy(occ_df)
     hvac_cols = list(hvac_df.columns)
@@ -213,31 +252,168 @@ def merge_occupancy_hvac(
         else:
             hvac["hvac_on"] = True
 
+    codebook = pd.Index(np.union1d(occ["zone_id"].unique(), hvac["zone_id"].unique()))
+    occ["zone_id"] = codebook.get_indexer(occ["zone_id"]).astype(np.int32)
+    hvac["zone_id"] = codebook.get_indexer(hvac["zone_id"]).astype(np.int32)
+
     occ["timestamp"] = occ["timestamp"].dt.floor(freq)
     hvac["timestamp"] = hvac["timestamp"].dt.floor(freq)
-    occ = (
-        occ.groupby(["timestamp", "zone_id"], as_index=False)["occupancy_count"]
-        .mean()
-        .sort_values("timestamp")
+    # groupby leaves both sides on a sorted (timestamp, zone_id) MultiIndex,
+    # so the join is an index-aligned merge with no rehashing of the keys.
+    occ = occ.groupby(["timestamp", "zone_id"])[["occupancy_count"]].mean()
+    hvac = hvac.groupby(["timestamp", "zone_id"]).first()
+    return occ.join(hvac, how=how).reset_index(), codebook
+
+
+def merge_occupancy_hvac(
+    occ_df: pd.DataFrame,
+    hvac_df: pd.DataFrame,
+    freq: str = "15min",
+    how: str = "inner",
+) -> pd.DataFrame:
+    """
+    Merge occupancy and HVAC data on timestamp and zone identifier.
+    """
+    merged, codebook = _merge_occupancy_hvac_coded(occ_df, hvac_df, freq=freq, how=how)
+    merged["zone_id"] = codebook.to_numpy()[merged["zone_id"].to_numpy()]
+    return merged
+
+
+@dataclass
+class MergedArrays:
+    """
+    Column-wise (struct-of-arrays) form of the merged occupancy + HVAC frame.
+
+    zone_id holds int32 codes into zone_codebook; numeric columns use the
+    narrowest dtype that holds them. The HVAC state is kept as a bitmap
+    (`np.packbits`, 1 bit per row) and unpacked on access via `hvac_on`.
+    """
+
+    timestamp: np.ndarray
+    zone_id: np.ndarray
+    occupancy: np.ndarray
+    hvac_on_bits: np.ndarray
+    energy: np.ndarray
+    zone_codebook: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @property
+    def hvac_on(self) -> np.ndarray:
+        return np.unpackbits(self.hvac_on_bits, count=len(self)).view(np.bool_)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "timestamp": self.timestamp,
+                "zone_id": self.zone_codebook[self.zone_id],
+                "occupancy_count": self.occupancy,
+                "hvac_on": self.hvac_on,
+                "energy_kwh": self.energy,
+            }
+        )
+
+
+def merge_occupancy_hvac_arrays(
+    occ_df: pd.DataFrame,
+    hvac_df: pd.DataFrame,
+    freq: str = "15min",
+    how: str = "inner",
+    energy_col: str = "energy_kwh",
+) -> MergedArrays:
+    """
+    Same merge as `merge_occupancy_hvac`, returned as typed NumPy arrays.
+
+    Missing occupancy/energy become 0 and missing HVAC state becomes off, the
+    same filling `compute_opportunity_for_savings` applies.
+    """
+    merged, codebook = _merge_occupancy_hvac_coded(occ_df, hvac_df, freq=freq, how=how)
+    if energy_col in merged.columns:
+        energy = pd.to_numeric(merged[energy_col], errors="coerce").fillna(0.0)
+    else:
+        energy = pd.Series(0.0, index=merged.index)
+
+    return MergedArrays(
+        timestamp=merged["timestamp"].to_numpy(dtype="datetime64[ns]"),
+        zone_id=merged["zone_id"].to_numpy(dtype=np.int32),
+        occupancy=merged["occupancy_count"].fillna(0.0).to_numpy(dtype=np.float32),
+        hvac_on_bits=np.packbits(merged["hvac_on"].fillna(False).to_numpy(dtype=np.bool_)),
+        energy=energy.to_numpy(dtype=np.float32),
+        zone_codebook=np.asarray(codebook, dtype=object),
     )
-    hvac = hvac.groupby(["timestamp", "zone_id"], as_index=False).first().sort_values("timestamp")
-    return occ.merge(hvac, on=["timestamp", "zone_id"], how=how)
 
 
 def add_weather_features(
     df: pd.DataFrame,
     weather_df: pd.DataFrame,
+    tolerance: str = "1h",
 ) -> pd.DataFrame:
     """
     Add aligned outside temperature to a timestamped dataframe.
+
+    Each row takes the latest weather reading at or before its timestamp
+    (within `tolerance`), so hourly weather lines up with 15-min data in a
+    single sorted merge.
     """
     if "timestamp" not in df.columns:
         raise ValueError("Input dataframe must contain 'timestamp'.")
 
-    base = df.copy()
-    base["timestamp"] = pd.to_datetime(base["timestamp"], errors="coerce")
+    base = df.reset_index(drop=True)
+    base["timestamp"] = pd.to_datetime(base["timestamp"], errors="coerce").dt.as_unit("ns")
     weather = normalize_weather(weather_df)
-    return base.merge(weather, on="timestamp", how="left")
+    weather["timestamp"] = weather["timestamp"].dt.as_unit("ns")
+    if not weather["timestamp"].is_monotonic_increasing:
+        # merge_asof needs sorted keys; normalize_weather usually leaves them so.
+        weather = weather.sort_values("timestamp", kind="stable").reset_index(drop=True)
+
+    left = base.loc[base["timestamp"].notna(), ["timestamp"]]
+    left = left.sort_values("timestamp", kind="stable").reset_index()
+    aligned = pd.merge_asof(
+        left,
+        weather,
+        on="timestamp",
+        direction="backward",
+        tolerance=pd.Timedelta(tolerance),
+    ).set_index("index")
+    base["outside_temp"] = aligned["outside_temp"]
+    return base
+
+
+@lru_cache(maxsize=4)
+def _tou_table_from_fingerprint(fingerprint: Tuple[Tuple, ...]) -> np.ndarray:
+    table = np.full((7, 24), np.nan, dtype=np.float64)
+    hours = np.arange(24)
+    for start, end, rate, day_of_week in fingerprint:
+        if start <= end:
+            mask = (hours >= start) & (hours < end)
+        else:
+            mask = (hours >= start) | (hours < end)
+        if day_of_week is None:
+            table[:, mask] = rate
+        else:
+            table[day_of_week, mask] = rate
+    table.setflags(write=False)
+    return table
+
+
+def tou_rate_table(tou_df: pd.DataFrame) -> np.ndarray:
+    """
+    Collapse a TOU schedule into a read-only float64[7, 24] (day_of_week, hour)
+    rate table. Rows apply in order; a missing/NaN `day_of_week` covers every
+    day. Tables are cached on the schedule's contents.
+    """
+    if "day_of_week" in tou_df.columns:
+        days = tou_df["day_of_week"]
+    else:
+        days = pd.Series(np.nan, index=tou_df.index)
+    fingerprint = tuple(
+        (int(start), int(end), float(rate), None if pd.isna(day) else int(day))
+        for start, end, rate, day in zip(
+            tou_df["start_hour"], tou_df["end_hour"], tou_df["rate_kwh"], days
+        )
+    )
+    return _tou_table_from_fingerprint(fingerprint)
 
 
 def add_tou_features(
@@ -249,6 +425,10 @@ def add_tou_features(
 
     Expected TOU columns:
     - start_hour, end_hour, rate_kwh
+    - optional day_of_week (0=Monday) to restrict a window to one day
+
+    Rates are looked up with a single gather into a 7x24 table; `tou_rate`
+    is float64, so the schedule's rates come back exactly.
     """
     required = {"start_hour", "end_hour", "rate_kwh"}
     if not required.issubset(set(tou_df.columns)):
@@ -258,23 +438,88 @@ def add_tou_features(
 
     out = df.copy()
     out["timestamp"] = pd.to_datetime(out["timestamp"], errors="coerce")
-    out["hour"] = out["timestamp"].dt.hour
-    out["tou_rate"] = np.nan
+    calendar = calendar_features(out["timestamp"])
+    out["hour"] = calendar["hour"]
 
-    for _, row in tou_df.iterrows():
-        start = int(row["start_hour"])
-        end = int(row["end_hour"])
-        rate = float(row["rate_kwh"])
-        if start <= end:
-            mask = (out["hour"] >= start) & (out["hour"] < end)
-        else:
-            mask = (out["hour"] >= start) | (out["hour"] < end)
-        out.loc[mask, "tou_rate"] = rate
+    table = tou_rate_table(tou_df)
+    valid = out["timestamp"].notna().to_numpy()
+    rates = np.full(len(out), np.nan, dtype=np.float64)
+    hour = np.asarray(calendar["hour"])[valid].astype(np.intp)
+    day_of_week = np.asarray(calendar["day_of_week"])[valid].astype(np.intp)
+    rates[valid] = table[day_of_week, hour]
+    out["tou_rate"] = rates
 
     out["tou_rate"] = out["tou_rate"].ffill().bfill()
     return out
 
 
+_EARTH_RADIUS_KM = 6371.0088
+
+
+@lru_cache(maxsize=4)
+def _distance_matrix_from_fingerprint(
+    lat: Tuple[float, ...], lon: Tuple[float, ...]
+) -> np.ndarray:
+    # Haversine in float64: zones in one building are metres apart, where the
+    # float32 rounding of sin^2(d/2) would swamp the distance itself.
+    lat_rad = np.deg2rad(np.asarray(lat))
+    lon_rad = np.deg2rad(np.asarray(lon))
+    cos_lat = np.cos(lat_rad)
+    half_dlat = np.sin((lat_rad[:, None] - lat_rad[None, :]) / 2.0)
+    half_dlon = np.sin((lon_rad[:, None] - lon_rad[None, :]) / 2.0)
+    a = half_dlat**2 + np.outer(cos_lat, cos_lat) * half_dlon**2
+    dist = (2.0 * _EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))).astype(np.float32)
+    dist.setflags(write=False)
+    return dist
+
+
+def zone_distance_matrix(
+    metadata_df: pd.DataFrame,
+    lat_col: str = "latitude",
+    lon_col: str = "longitude",
+) -> Tuple[pd.Index, np.ndarray]:
+    """
+    Pairwise great-circle distances (km) between zones.
+
+    Returns the zone_id index and a read-only float32[Z, Z] matrix in the same
+    order, computed in one broadcast expression. Matrices are cached on the
+    zones' coordinates.
+    """
+    required = ["zone_id", lat_col, lon_col]
+    missing = [col for col in required if col not in metadata_df.columns]
+    if missing:
+        raise ValueError(f"Metadata must contain columns: {missing}")
+
+    coords = metadata_df[required].dropna().drop_duplicates("zone_id")
+    zones = pd.Index(coords["zone_id"].astype(str), name="zone_id")
+    dist = _distance_matrix_from_fingerprint(
+        tuple(coords[lat_col].astype(float)), tuple(coords[lon_col].astype(float))
+    )
+    return zones, dist
+
+
+def add_zone_proximity_features(
+    df: pd.DataFrame,
+    metadata_df: pd.DataFrame,
+    lat_col: str = "latitude",
+    lon_col: str = "longitude",
+) -> pd.DataFrame:
+    """
+    Add `nearest_zone_km`: distance from each row's zone to its closest other
+    zone (NaN for zones without coordinates), gathered per row by zone code.
+    """
+    if "zone_id" not in df.columns:
+        raise ValueError("Input dataframe must contain 'zone_id'.")
+
+    zones, dist = zone_distance_matrix(metadata_df, lat_col=lat_col, lon_col=lon_col)
+    off_diagonal = np.where(np.eye(len(zones), dtype=bool), np.inf, dist)
+    # Trailing slot catches get_indexer's -1 for zones without coordinates.
+    nearest = np.append(off_diagonal.min(axis=1, initial=np.inf), np.inf).astype(np.float32)
+    nearest[~np.isfinite(nearest)] = np.nan
+    codes = zones.get_indexer(df["zone_id"].astype(str))
+    return df.assign(nearest_zone_km=nearest[codes])
+
+
 def engineer_features(
     df: pd.DataFrame,
     include_time_features: bool = True,
@@ -283,27 +528,44 @@ def engineer_features(
 ) -> pd.DataFrame:
     """
     Generic feature engineering helper for occupancy time series.
+
+    The input is not copied up front: new columns are collected and appended
+    in one concat, so the result may share column buffers with `df` (safe
+    under pandas copy-on-write).
     """
     if lag_periods is None:
         lag_periods = DEFAULT_LAG_PERIODS
 
-    result = df.copy()
-    timestamp_col = "timestamp" if "timestamp" in result.columns else "ds"
-    target_col = "occupancy_count" if "occupancy_count" in result.columns else "y"
+    timestamp_col = "timestamp" if "timestamp" in df.columns else "ds"
+    target_col = "occupancy_count" if "occupancy_count" in df.columns else "y"
 
-    result[timestamp_col] = pd.to_datetime(result[timestamp_col], errors="coerce")
-    result = result.sort_values(timestamp_col).reset_index(drop=True)
+    result = df.reset_index(drop=True)
+    timestamps = pd.to_datetime(result[timestamp_col], errors="coerce")
+    if not timestamps.is_monotonic_increasing:
+        order = timestamps.sort_values(kind="stable").index
+        result = result.take(order).reset_index(drop=True)
+        timestamps = timestamps.take(order).reset_index(drop=True)
+    if timestamps.dtype != result[timestamp_col].dtype:
+        result = result.assign(**{timestamp_col: timestamps})
 
+    new_cols = {}
     if include_time_features:
-        result["hour"] = result[timestamp_col].dt.hour
-        result["day_of_week"] = result[timestamp_col].dt.dayofweek
-        result["is_weekend"] = result["day_of_week"].isin([5, 6]).astype(int)
+        new_cols.update(calendar_features(timestamps))
 
     if include_lag_features and target_col in result.columns:
-        for lag in lag_periods:
-            result[f"{target_col}_lag_{lag}"] = result[target_col].shift(lag)
+        # One groupby object serves every lag so group indexing is paid once;
+        # rows are already chronological, so per-zone shifts stay causal.
+        if "zone_id" in result.columns:
+            target = result.groupby("zone_id", sort=False, observed=True)[target_col]
+        else:
+            target = result[target_col]
+        new_cols.update({f"{target_col}_lag_{lag}": target.shift(lag) for lag in lag_periods})
 
-    return result
+    if not new_cols:
+        return result
+    features = pd.DataFrame(new_cols, index=result.index)
+    result = result.drop(columns=[col for col in new_cols if col in result.columns])
+    return pd.concat([result, features], axis=1)
 
 
 def compute_opportunity_for_savings(
@@ -323,11 +585,21 @@ def compute_opportunity_for_savings(
 
     result = df.copy()
     result[occupancy_col] = pd.to_numeric(result[occupancy_col], errors="coerce").fillna(0)
-    hvac_on = result[hvac_state_col].astype(bool)
-    result["is_opportunity"] = (result[occupancy_col] <= 0) & hvac_on
-
-    if energy_col and energy_col in result.columns:
+    hvac_on = result[hvac_state_col].astype(bool).to_numpy()
+    has_energy = bool(energy_col and energy_col in result.columns)
+    if has_energy:
         energy = pd.to_numeric(result[energy_col], errors="coerce").fillna(0.0)
-        result["potential_energy_savings"] = np.where(result["is_opportunity"], energy, 0.0)
+        energy = energy.to_numpy(dtype=np.float64)
+    else:
+        energy = np.zeros(len(result))
+
+    is_opportunity, savings, total = opportunity(
+        result[occupancy_col].to_numpy(dtype=np.float64), hvac_on, energy
+    )
+    result["is_opportunity"] = is_opportunity
+
+    if has_energy:
+        result["potential_energy_savings"] = savings
+        result.attrs["total_potential_energy_savings"] = total
 
     return result
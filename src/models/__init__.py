@@ -1,6 +1,6 @@
 """Forecasting models for occupancy prediction."""
 
-from .prophet_baseline import ProphetOccupancyModel, predict_occupancy
+from .prophet_baseline import ProphetOccupancyModel, fit_all_zones, predict_occupancy
 from .transformer_baseline import TransformerOccupancyModel
 try:
     from .xgBoost import occupancy_predictor
@@ -10,6 +10,7 @@ except Exception:  # pragma: no cover - optional dependency (xgboost)
 
 __all__ = [
     "ProphetOccupancyModel",
+    "fit_all_zones",
     "predict_occupancy",
     "TransformerOccupancyModel",
     "occupancy_predictor",
@@ -0,0 +1,136 @@
+"""
+PyTorch building blocks for the transformer occupancy model.
+
+Imported lazily by `transformer_baseline` so the package stays importable
+without torch installed.
+"""
+
+import math
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+from torch import nn
+from torch.utils.data import Dataset
+
+
+class WindowDataset(Dataset):
+    """
+    Serve (X, y) windows from strided views, copying only the requested rows.
+
+    X and y are the read-only views from `_prepare_sequences`; each item is
+    materialized into its own contiguous tensor on access.
+    """
+
+    def __init__(self, X: np.ndarray, y: np.ndarray):
+        self.X = X
+        self.y = y
+
+    def __len__(self) -> int:
+        return len(self.X)
+
+    def __getitem__(self, idx):
+        x = torch.from_numpy(np.array(self.X[idx]))
+        y = torch.from_numpy(np.array(self.y[idx]))
+        return x, y
+
+
+def sinusoidal_positional_encoding(max_len: int, d_model: int) -> torch.Tensor:
+    """Standard sin/cos positional encoding table of shape (max_len, d_model)."""
+    position = torch.arange(max_len, dtype=torch.float32).unsqueeze(1)
+    div_term = torch.exp(
+        torch.arange(0, d_model, 2, dtype=torch.float32) * (-math.log(10000.0) / d_model)
+    )
+    pe = torch.zeros(max_len, d_model)
+    pe[:, 0::2] = torch.sin(position * div_term)
+    pe[:, 1::2] = torch.cos(position * div_term)[:, : d_model // 2]
+    return pe
+
+
+class MultiHeadAttention(nn.Module):
+    """
+    Causal self-attention on `F.scaled_dot_product_attention`.
+
+    SDPA dispatches to fused FlashAttention / memory-efficient kernels when
+    available, so the (B, H, L, L) score matrix is never written to memory.
+    """
+
+    def __init__(self, d_model: int, n_heads: int, dropout: float = 0.0):
+        super().__init__()
+        if d_model % n_heads:
+            raise ValueError("d_model must be divisible by n_heads")
+        self.n_heads = n_heads
+        self.dropout = dropout
+        self.qkv = nn.Linear(d_model, 3 * d_model)
+        self.out = nn.Linear(d_model, d_model)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        batch, length, d_model = x.shape
+        qkv = self.qkv(x).view(batch, length, 3, self.n_heads, d_model // self.n_heads)
+        q, k, v = qkv.permute(2, 0, 3, 1, 4)
+        attn = F.scaled_dot_product_attention(
+            q,
+            k,
+            v,
+            attn_mask=None,
+            dropout_p=self.dropout if self.training else 0.0,
+            is_causal=True,
+        )
+        return self.out(attn.transpose(1, 2).reshape(batch, length, d_model))
+
+
+class EncoderBlock(nn.Module):
+    """Pre-norm transformer block: causal attention followed by a GELU MLP."""
+
+    def __init__(self, d_model: int, n_heads: int, dropout: float = 0.0):
+        super().__init__()
+        self.norm1 = nn.LayerNorm(d_model)
+        self.attn = MultiHeadAttention(d_model, n_heads, dropout)
+        self.norm2 = nn.LayerNorm(d_model)
+        self.mlp = nn.Sequential(
+            nn.Linear(d_model, 4 * d_model),
+            nn.GELU(),
+            nn.Linear(4 * d_model, d_model),
+            nn.Dropout(dropout),
+        )
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        x = x + self.attn(self.norm1(x))
+        return x + self.mlp(self.norm2(x))
+
+
+class OccupancyTransformer(nn.Module):
+    """
+    Encoder-only forecaster: (B, seq_length, F) -> (B, pred_length).
+
+    The horizon is read off the final input position, which under the causal
+    mask has attended to the whole window. The positional encoding is built
+    once at init and kept as a non-persistent buffer, so forward only reads it.
+    """
+
+    def __init__(
+        self,
+        n_features: int,
+        d_model: int,
+        n_heads: int,
+        n_layers: int,
+        pred_length: int,
+        max_len: int,
+        dropout: float = 0.1,
+    ):
+        super().__init__()
+        self.input_proj = nn.Linear(n_features, d_model)
+        self.register_buffer(
+            "pe", sinusoidal_positional_encoding(max_len, d_model).unsqueeze(0), persistent=False
+        )
+        self.blocks = nn.ModuleList(
+            EncoderBlock(d_model, n_heads, dropout) for _ in range(n_layers)
+        )
+        self.norm = nn.LayerNorm(d_model)
+        self.head = nn.Linear(d_model, pred_length)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        h = self.input_proj(x) + self.pe[:, : x.size(1)]
+        for block in self.blocks:
+            h = block(h)
+        return self.head(self.norm(h[:, -1]))
@@ -3,6 +3,8 @@ Prophet-based baseline model for occupancy forecasting.
 
 If Prophet is unavailable in the runtime environment, this module falls back
 to a deterministic seasonal naive model so the pipeline remains runnable.
+Passing backend="statsforecast" fits StatsForecast's MSTL instead of Prophet,
+which avoids Stan and is much faster when fitting many zones.
 """
 
 from __future__ import annotations
@@ -13,12 +15,20 @@ from typing import Any, Dict, Optional
 
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed, parallel_config
 
 try:
     from prophet import Prophet
 except ImportError:  # pragma: no cover - depends on runtime environment
     Prophet = None
 
+try:
+    from statsforecast import StatsForecast
+    from statsforecast.models import MSTL
+except ImportError:  # pragma: no cover - depends on runtime environment
+    StatsForecast = None
+    MSTL = None
+
 from src.data.preprocess import prepare_occupancy_forecast_dataset
 
 
@@ -32,16 +42,33 @@ class ProphetOccupancyModel:
     """
     Occupancy forecasting model with Prophet primary backend and
     seasonal-naive fallback backend.
+
+    `backend="statsforecast"` (taken from the keyword arguments) selects an
+    MSTL model with daily and weekly seasonality instead of Prophet. MSTL
+    ignores `outside_temp`, and timestamps at or before the end of training
+    are predicted from the seasonal profile. `n_jobs` sets StatsForecast's
+    worker count and is unused by Prophet; the remaining keyword arguments
+    are Prophet options and are rejected with the MSTL backend.
     """
 
     def __init__(
         self,
         zone_id: Optional[str] = None,
         freq: str = "15min",
-        **prophet_kwargs: Dict[str, Any],
+        n_jobs: int = 1,
+        **prophet_kwargs: Any,
     ):
         self.zone_id = zone_id
         self.freq = freq
+        self.n_jobs = n_jobs
+        self.backend_name = prophet_kwargs.pop("backend", "prophet")
+        if self.backend_name not in ("prophet", "statsforecast"):
+            raise ValueError("backend must be 'prophet' or 'statsforecast'")
+        if self.backend_name == "statsforecast" and prophet_kwargs:
+            raise ValueError(
+                "Prophet options are not supported with backend='statsforecast': "
+                f"{sorted(prophet_kwargs)}"
+            )
         self.prophet_kwargs = prophet_kwargs
 
         self.model = None
@@ -52,20 +79,30 @@ class ProphetOccupancyModel:
         self._temp_median: Optional[float] = None
 
     @staticmethod
-    def _normalize_fit_df(df: pd.DataFrame) -> pd.DataFrame:
-        if "ds" not in df.columns or "y" not in df.columns:
-            raise ValueError("Fit dataframe must contain columns ['ds', 'y'].")
-
-        out = df.copy()
-        out["ds"] = pd.to_datetime(out["ds"], errors="coerce")
-        out["y"] = pd.to_numeric(out["y"], errors="coerce")
-        if "outside_temp" in out.columns:
-            out["outside_temp"] = pd.to_numeric(out["outside_temp"], errors="coerce")
-
-        out = out.dropna(subset=["ds", "y"]).sort_values("ds").reset_index(drop=True)
-        if out.empty:
+    def _train_frame(
+        ds: np.ndarray,
+        y: np.ndarray,
+        outside_temp: Optional[np.ndarray] = None,
+    ) -> pd.DataFrame:
+        ds = pd.DatetimeIndex(pd.to_datetime(np.asarray(ds), errors="coerce"))
+        y = pd.to_numeric(np.asarray(y), errors="coerce").astype(float)
+        if len(ds) != len(y):
+            raise ValueError("ds and y must have the same length.")
+        columns = {"ds": ds, "y": y}
+        if outside_temp is not None:
+            columns["outside_temp"] = pd.to_numeric(
+                np.asarray(outside_temp), errors="coerce"
+            ).astype(float)
+
+        valid = ~(ds.isna() | np.isnan(y))
+        if not valid.any():
             raise ValueError("No valid training rows after parsing ['ds', 'y'].")
-        return out
+        if not valid.all():
+            columns = {name: values[valid] for name, values in columns.items()}
+        if not columns["ds"].is_monotonic_increasing:
+            order = np.argsort(columns["ds"].asi8, kind="stable")
+            columns = {name: values[order] for name, values in columns.items()}
+        return pd.DataFrame(columns)
 
     @staticmethod
     def _slot_key(ts: pd.Series) -> pd.MultiIndex:
@@ -73,22 +110,47 @@ class ProphetOccupancyModel:
         return pd.MultiIndex.from_arrays([ts.dt.dayofweek, minutes], names=["dow", "slot"])
 
     def _build_seasonal_fallback(self, df: pd.DataFrame) -> None:
-        keyed = df.copy()
-        keyed["dow"] = keyed["ds"].dt.dayofweek
-        keyed["slot"] = keyed["ds"].dt.hour * 60 + keyed["ds"].dt.minute
-        profile = keyed.groupby(["dow", "slot"])["y"].mean()
-        global_mean = float(keyed["y"].mean()) if len(keyed) else 0.0
+        keys = self._slot_key(df["ds"])
+        profile = (
+            df["y"]
+            .groupby([keys.get_level_values("dow"), keys.get_level_values("slot")])
+            .mean()
+        )
+        global_mean = float(df["y"].mean()) if len(df) else 0.0
         self._seasonal = _SeasonalProfile(profile=profile, global_mean=global_mean)
         self.backend = "seasonal_naive"
 
     def fit(self, df: pd.DataFrame) -> "ProphetOccupancyModel":
-        train = self._normalize_fit_df(df)
+        if "ds" not in df.columns or "y" not in df.columns:
+            raise ValueError("Fit dataframe must contain columns ['ds', 'y'].")
+        return self.fit_arrays(
+            df["ds"].to_numpy(),
+            df["y"].to_numpy(),
+            df["outside_temp"].to_numpy() if "outside_temp" in df.columns else None,
+        )
+
+    def fit_arrays(
+        self,
+        ds: np.ndarray,
+        y: np.ndarray,
+        outside_temp: Optional[np.ndarray] = None,
+    ) -> "ProphetOccupancyModel":
+        """
+        Fit from aligned timestamp/target (and optional temperature) arrays.
+
+        Invalid rows are dropped and rows are sorted only when needed; the
+        single training frame built here is what Prophet/MSTL consume.
+        """
+        train = self._train_frame(ds, y, outside_temp)
         self._fitted_df = train
         self._uses_temp = "outside_temp" in train.columns and train["outside_temp"].notna().any()
         self._temp_median = (
             float(train["outside_temp"].median()) if self._uses_temp else None
         )
 
+        if self.backend_name == "statsforecast":
+            return self._fit_statsforecast(train)
+
         if Prophet is None:
             self._build_seasonal_fallback(train)
             self.model = None
@@ -114,6 +176,61 @@ class ProphetOccupancyModel:
         self.backend = "prophet"
         return self
 
+    def _fit_statsforecast(self, train: pd.DataFrame) -> "ProphetOccupancyModel":
+        self._build_seasonal_fallback(train)
+        self.model = None
+        steps_per_day = int(pd.Timedelta("1D") / pd.Timedelta(self.freq))
+        # MSTL needs two full cycles of each season it decomposes.
+        seasons = [
+            m for m in (steps_per_day, 7 * steps_per_day) if m > 1 and len(train) >= 2 * m
+        ]
+        if StatsForecast is None or not seasons:
+            return self
+
+        sf = StatsForecast(
+            models=[MSTL(season_length=seasons)],
+            freq=self.freq,
+            n_jobs=self.n_jobs,
+        )
+        sf.fit(train[["ds", "y"]].assign(unique_id=str(self.zone_id)))
+        self.model = sf
+        self.backend = "statsforecast"
+        return self
+
+    def _predict_statsforecast(self, future: pd.DataFrame) -> pd.DataFrame:
+        assert self.model is not None and self._fitted_df is not None
+        step = pd.Timedelta(self.freq)
+        last_ds = self._fitted_df["ds"].max()
+        ahead = (future["ds"] - last_ds) // step
+        out = self._seasonal_forecast(future)
+        if ahead.max() > 0:
+            forecast = self.model.predict(h=int(ahead.max()), level=[80])
+            yhat = forecast["MSTL"].to_numpy(dtype=float)
+            lower = forecast["MSTL-lo-80"].to_numpy(dtype=float)
+            upper = forecast["MSTL-hi-80"].to_numpy(dtype=float)
+            is_future = (ahead > 0).to_numpy()
+            idx = ahead[is_future].to_numpy(dtype=np.int64) - 1
+            out.loc[is_future, "yhat"] = yhat[idx]
+            out.loc[is_future, "yhat_lower"] = lower[idx]
+            out.loc[is_future, "yhat_upper"] = upper[idx]
+        return out
+
+    def _seasonal_forecast(self, future: pd.DataFrame) -> pd.DataFrame:
+        assert self._seasonal is not None
+        keys = self._slot_key(future["ds"])
+        yhat = np.array(
+            [self._seasonal.profile.get(key, self._seasonal.global_mean) for key in keys],
+            dtype=float,
+        )
+        return pd.DataFrame(
+            {
+                "ds": future["ds"],
+                "yhat": yhat,
+                "yhat_lower": yhat,
+                "yhat_upper": yhat,
+            }
+        )
+
     @staticmethod
     def _normalize_future_df(future_df: pd.DataFrame) -> pd.DataFrame:
         if "ds" not in future_df.columns:
@@ -160,21 +277,10 @@ class ProphetOccupancyModel:
             out = forecast[["ds", "yhat", "yhat_lower", "yhat_upper"]].copy()
             return self._post_process(out)
 
-        assert self._seasonal is not None
-        keys = self._slot_key(future["ds"])
-        yhat = np.array(
-            [self._seasonal.profile.get(key, self._seasonal.global_mean) for key in keys],
-            dtype=float,
-        )
-        out = pd.DataFrame(
-            {
-                "ds": future["ds"],
-                "yhat": yhat,
-                "yhat_lower": yhat,
-                "yhat_upper": yhat,
-            }
-        )
-        return self._post_process(out)
+        if self.backend == "statsforecast":
+            return self._post_process(self._predict_statsforecast(future))
+
+        return self._post_process(self._seasonal_forecast(future))
 
     def predict(
         self,
@@ -287,6 +393,49 @@ class ProphetOccupancyModel:
         return {name: all_metrics[name] for name in metrics if name in all_metrics}
 
 
+def _fit_one(
+    zone_id: str,
+    zone_df: pd.DataFrame,
+    freq: str,
+    prophet_kwargs: Dict[str, Any],
+) -> ProphetOccupancyModel:
+    model = ProphetOccupancyModel(zone_id=zone_id, freq=freq, **prophet_kwargs)
+    return model.fit(zone_df)
+
+
+def fit_all_zones(
+    df: pd.DataFrame,
+    freq: str = "15min",
+    n_jobs: int = -1,
+    **prophet_kwargs: Any,
+) -> Dict[str, ProphetOccupancyModel]:
+    """
+    Fit one ProphetOccupancyModel per zone in parallel worker processes.
+
+    `df` holds all zones with columns [zone_id, ds, y] and optionally
+    outside_temp ([timestamp, occupancy_count] are accepted for ds/y).
+    Returns a dict mapping zone_id to its fitted model.
+    """
+    if "zone_id" not in df.columns:
+        raise ValueError("Fit dataframe must contain 'zone_id'.")
+    fit_df = df.rename(
+        columns={
+            col: new
+            for col, new in [("timestamp", "ds"), ("occupancy_count", "y")]
+            if new not in df.columns
+        }
+    )
+    groups = fit_df.drop(columns="zone_id").groupby(fit_df["zone_id"].astype(str), sort=True)
+    # Stan and BLAS each start their own threads; one per worker avoids
+    # oversubscribing the cores already used by the process pool.
+    with parallel_config(backend="loky", inner_max_num_threads=1):
+        models = Parallel(n_jobs=n_jobs, batch_size="auto")(
+            delayed(_fit_one)(zone_id, zone_df, freq, prophet_kwargs)
+            for zone_id, zone_df in groups
+        )
+    return {model.zone_id: model for model in models}
+
+
 def predict_occupancy(
     zone_id: str,
     start_ts: datetime | str,
@@ -297,7 +446,7 @@ def predict_occupancy(
     weather_history_df: Optional[pd.DataFrame] = None,
     weather_future_df: Optional[pd.DataFrame] = None,
     train_ratio: float = 0.8,
-    **prophet_kwargs: Dict[str, Any],
+    **prophet_kwargs: Any,
 ) -> pd.DataFrame:
     """
     Service-style interface for single-zone occupancy prediction.
@@ -6,10 +6,14 @@ Can capture complex temporal dependencies and potentially outperform Prophet
 for longer forecast horizons or when external features are important.
 """
 
+import logging
+
 import pandas as pd
 import numpy as np
 from typing import Optional, Dict, Any, Tuple
 
+LOGGER = logging.getLogger(__name__)
+
 
 class TransformerOccupancyModel:
     """
@@ -63,20 +67,38 @@ class TransformerOccupancyModel:
         self.kwargs = kwargs
         self.model = None
         self.scaler = None
+        self.feature_cols = None
+        self.target_idx = 0
+        self.target_col = "occupancy_count"
+        self.history = []
+        self.device = None
+        self._compiled = None
 
-    def _build_model(self):
+    def _build_model(self, n_features: int):
         """
         Build the transformer model architecture.
 
-        TODO:
-            - Implement transformer encoder-decoder or encoder-only architecture
-            - Add positional encoding
-            - Configure for time-series forecasting
+        Encoder-only stack of pre-norm blocks whose attention runs through
+        `torch.nn.functional.scaled_dot_product_attention` (see
+        `_transformer_nn.MultiHeadAttention`), with a linear head that emits
+        all `pred_length` steps at once. Sinusoidal positional encoding is
+        precomputed for `seq_length + pred_length` positions.
+
+        Args:
+            n_features: Number of input features per timestep.
         """
-        # TODO: Implement model building
-        # import torch
-        # import torch.nn as nn
-        raise NotImplementedError("Implement transformer architecture")
+        from ._transformer_nn import OccupancyTransformer
+
+        self.model = OccupancyTransformer(
+            n_features=n_features,
+            d_model=self.d_model,
+            n_heads=self.n_heads,
+            n_layers=self.n_layers,
+            pred_length=self.pred_length,
+            max_len=self.seq_length + self.pred_length,
+            dropout=float(self.kwargs.get("dropout", 0.1)),
+        )
+        return self.model
 
     def _prepare_sequences(
         self,
@@ -87,21 +109,63 @@ class TransformerOccupancyModel:
         """
         Prepare input/output sequences for training.
 
+        Windows are built with `sliding_window_view`, so X and y are read-only
+        strided views over one scaled (N, F) buffer rather than N copies of
+        each window; rows are only materialized when a batch is drawn.
+
         Args:
             df: DataFrame with timestamp index and features.
             target_col: Column name for the target variable.
-            feature_cols: List of feature columns to include.
+            feature_cols: List of feature columns to include. The target is
+                always included (first, if not listed).
 
         Returns:
-            Tuple of (X, y) arrays for training.
+            Tuple of (X, y) arrays with shapes
+            (n_windows, seq_length, n_features) and (n_windows, pred_length).
 
         TODO:
-            - Implement sliding window sequence creation
-            - Handle multiple features
             - Add proper train/val/test splitting
         """
-        # TODO: Implement sequence preparation
-        raise NotImplementedError("Implement sequence preparation")
+        if feature_cols is None:
+            feature_cols = [target_col]
+        elif target_col not in feature_cols:
+            feature_cols = [target_col] + list(feature_cols)
+        missing = [col for col in feature_cols if col not in df.columns]
+        if missing:
+            raise ValueError(f"Missing feature columns: {missing}")
+
+        self.feature_cols = feature_cols
+        self.target_idx = feature_cols.index(target_col)
+        return self._sequences_from_array(df[feature_cols].to_numpy(dtype=np.float32))
+
+    def _sequences_from_array(
+        self, arr: np.ndarray, fit_rows: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Scale an (N, F) float32 array and window it (see `_prepare_sequences`).
+
+        A new scaler is fit on the first `fit_rows` rows (all rows if None),
+        so held-out rows at the end do not leak into its statistics.
+        """
+        n_windows = len(arr) - self.seq_length - self.pred_length + 1
+        if n_windows < 1:
+            raise ValueError(
+                f"Need at least seq_length + pred_length = "
+                f"{self.seq_length + self.pred_length} rows, got {len(arr)}."
+            )
+
+        if self.scaler is None:
+            fit = arr[:fit_rows]
+            mean = fit.mean(axis=0)
+            std = fit.std(axis=0)
+            self.scaler = (mean, np.where(std > 0, std, 1.0).astype(np.float32))
+        mean, std = self.scaler
+        arr = (arr - mean) / std
+
+        sliding_window_view = np.lib.stride_tricks.sliding_window_view
+        X = sliding_window_view(arr, (self.seq_length, arr.shape[1]))[:n_windows, 0]
+        y = sliding_window_view(arr[self.seq_length :, self.target_idx], self.pred_length)
+        return X, y
 
     def fit(
         self,
@@ -110,28 +174,187 @@ class TransformerOccupancyModel:
         batch_size: int = 32,
         learning_rate: float = 1e-3,
         val_split: float = 0.2,
+        target_col: str = "occupancy_count",
+        feature_cols: Optional[list] = None,
     ) -> "TransformerOccupancyModel":
         """
         Train the transformer model on historical occupancy data.
 
+        Unpacks the target and feature columns and delegates to `fit_arrays`;
+        rows are ordered by `timestamp` when that column is present.
+
         Args:
             df: DataFrame with occupancy and feature columns.
             epochs: Number of training epochs.
             batch_size: Training batch size.
             learning_rate: Optimizer learning rate.
-            val_split: Fraction of data for validation.
+            val_split: Fraction of data for validation (the most recent windows).
+            target_col: Column name for the target variable.
+            feature_cols: Extra feature columns fed alongside the target.
+
+        Returns:
+            self (fitted model)
+        """
+        extra = [col for col in (feature_cols or []) if col != target_col]
+        missing = [col for col in [target_col] + extra if col not in df.columns]
+        if missing:
+            raise ValueError(f"Missing feature columns: {missing}")
+
+        return self.fit_arrays(
+            df["timestamp"].to_numpy() if "timestamp" in df.columns else None,
+            df[target_col].to_numpy(dtype=np.float32),
+            df[extra].to_numpy(dtype=np.float32) if extra else None,
+            epochs=epochs,
+            batch_size=batch_size,
+            learning_rate=learning_rate,
+            val_split=val_split,
+            target_col=target_col,
+            feature_cols=extra,
+        )
+
+    def fit_arrays(
+        self,
+        ds: Optional[np.ndarray],
+        y: np.ndarray,
+        exog: Optional[np.ndarray] = None,
+        epochs: int = 100,
+        batch_size: int = 32,
+        learning_rate: float = 1e-3,
+        val_split: float = 0.2,
+        target_col: str = "occupancy_count",
+        feature_cols: Optional[list] = None,
+    ) -> "TransformerOccupancyModel":
+        """
+        Train the transformer directly on arrays, without a DataFrame.
+
+        On CUDA the forward pass and loss run under BF16 autocast (weights and
+        optimizer state stay FP32) and residual FP32 matmuls may use TF32.
+        On CPU training runs in plain FP32.
+
+        Args:
+            ds: Timestamps of shape (N,), used only to put rows in
+                chronological order; None if `y` is already ordered.
+            y: Target values of shape (N,).
+            exog: Optional extra features of shape (N, K).
+            epochs, batch_size, learning_rate, val_split: As in `fit`.
+            target_col: Name recorded for the target (used by `predict`).
+            feature_cols: Names of the `exog` columns (used by `predict`);
+                defaults to exog_0..exog_{K-1}.
 
         Returns:
             self (fitted model)
 
         TODO:
-            - Implement training loop
             - Add early stopping
             - Add learning rate scheduling
-            - Log training metrics
         """
-        # TODO: Implement training
-        raise NotImplementedError("Implement transformer training")
+        import torch
+        from torch.utils.data import DataLoader
+
+        from ._transformer_nn import WindowDataset
+
+        arr = np.asarray(y, dtype=np.float32).reshape(-1, 1)
+        if exog is not None:
+            exog = np.asarray(exog, dtype=np.float32).reshape(len(arr), -1)
+            arr = np.concatenate([arr, exog], axis=1)
+        if ds is not None:
+            ds = np.asarray(ds)
+            if len(ds) != len(arr):
+                raise ValueError("ds and y must have the same length.")
+            if not np.all(ds[1:] >= ds[:-1]):
+                arr = arr[np.argsort(ds, kind="stable")]
+        if feature_cols is None:
+            feature_cols = [f"exog_{i}" for i in range(arr.shape[1] - 1)]
+        if len(feature_cols) != arr.shape[1] - 1:
+            raise ValueError("feature_cols must name every exog column.")
+
+        self.scaler = None
+        self.target_col = target_col
+        self.feature_cols = [target_col] + list(feature_cols)
+        self.target_idx = 0
+        n_windows = len(arr) - self.seq_length - self.pred_length + 1
+        n_val = int(max(n_windows, 0) * val_split)
+        n_train = n_windows - n_val
+        # The scaler only sees rows covered by training windows (inputs and
+        # targets), not the most recent rows reserved for validation.
+        X, y = self._sequences_from_array(
+            arr, fit_rows=n_train + self.seq_length + self.pred_length - 1
+        )
+        if n_train < 1:
+            raise ValueError("Not enough windows left for training after val_split.")
+
+        device = torch.device(
+            self.kwargs.get("device", "cuda" if torch.cuda.is_available() else "cpu")
+        )
+        use_bf16 = device.type == "cuda" and torch.cuda.is_bf16_supported()
+        if device.type == "cuda":
+            torch.set_float32_matmul_precision("high")
+
+        model = self._build_model(n_features=X.shape[2]).to(device)
+        optimizer = torch.optim.AdamW(model.parameters(), lr=learning_rate)
+        loss_fn = torch.nn.MSELoss()
+        loader_kwargs = {"batch_size": batch_size, "pin_memory": device.type == "cuda"}
+        train_loader = DataLoader(
+            WindowDataset(X[:n_train], y[:n_train]), shuffle=True, **loader_kwargs
+        )
+        val_loader = (
+            DataLoader(WindowDataset(X[n_train:], y[n_train:]), **loader_kwargs)
+            if n_val
+            else None
+        )
+
+        def run_epoch(loader, train: bool) -> float:
+            model.train(train)
+            total, count = 0.0, 0
+            with torch.set_grad_enabled(train):
+                for xb, yb in loader:
+                    xb = xb.to(device, non_blocking=True)
+                    yb = yb.to(device, non_blocking=True)
+                    with torch.autocast(device.type, dtype=torch.bfloat16, enabled=use_bf16):
+                        pred = model(xb)
+                    loss = loss_fn(pred.float(), yb)
+                    if train:
+                        optimizer.zero_grad(set_to_none=True)
+                        loss.backward()
+                        optimizer.step()
+                    total += float(loss.detach()) * len(xb)
+                    count += len(xb)
+            return total / max(count, 1)
+
+        self.history = []
+        for epoch in range(epochs):
+            record = {"epoch": epoch, "train_loss": run_epoch(train_loader, train=True)}
+            if val_loader is not None:
+                record["val_loss"] = run_epoch(val_loader, train=False)
+            self.history.append(record)
+            LOGGER.debug("Transformer epoch %s: %s", epoch, record)
+
+        self.device = device
+        self._compiled = None
+        return self
+
+    def _inference_model(self, n_features: int):
+        """
+        Return the module used by `predict`, compiling it on first use.
+
+        On CUDA (or with `compile=True` in the model kwargs) the model is
+        wrapped in `torch.compile(mode="reduce-overhead")`, which replays
+        captured CUDA graphs instead of relaunching every kernel per
+        autoregressive step. A warmup call on a (1, seq_length, F) batch
+        triggers compilation and graph capture up front.
+        """
+        import torch
+
+        use_compile = self.kwargs.get("compile", self.device.type == "cuda")
+        if not use_compile:
+            return self.model
+        if self._compiled is None:
+            self._compiled = torch.compile(self.model, mode="reduce-overhead", fullgraph=True)
+            dummy = torch.zeros(1, self.seq_length, n_features, device=self.device)
+            with torch.inference_mode():
+                for _ in range(2):
+                    self._compiled(dummy)
+        return self._compiled
 
     def predict(
         self,
@@ -141,23 +364,68 @@ class TransformerOccupancyModel:
         """
         Generate occupancy forecasts.
 
+        Forecasts are produced `pred_length` steps at a time under
+        `torch.inference_mode`; each block of predicted (scaled) occupancy is
+        written in place into one preallocated context buffer, which then
+        feeds the next block. Non-target features are held at their last
+        observed values over the forecast horizon.
+
         Args:
-            df: Recent historical data for conditioning.
+            df: Recent historical data for conditioning (at least
+                `seq_length` rows with the training feature columns).
             horizon: Number of steps to forecast (default: pred_length).
 
         Returns:
-            DataFrame with forecasted occupancy values.
+            DataFrame with forecasted occupancy values
+            ([timestamp,] [zone_id,] predicted_occupancy).
 
         TODO:
-            - Implement autoregressive prediction
             - Add uncertainty estimation
-            - Handle variable forecast horizons
         """
         if self.model is None:
             raise ValueError("Model must be fitted before prediction")
+        import torch
+
+        horizon = self.pred_length if horizon is None else int(horizon)
+        if horizon < 1:
+            raise ValueError("horizon must be >= 1")
+        missing = [col for col in self.feature_cols if col not in df.columns]
+        if missing:
+            raise ValueError(f"Missing feature columns: {missing}")
+        if len(df) < self.seq_length:
+            raise ValueError(f"Need at least seq_length = {self.seq_length} rows, got {len(df)}.")
+
+        mean, std = self.scaler
+        context = (df[self.feature_cols].to_numpy(dtype=np.float32)[-self.seq_length :] - mean) / std
+        n_features = context.shape[1]
+        n_blocks = -(-horizon // self.pred_length)
+        total = n_blocks * self.pred_length
+
+        buf = torch.empty(1, self.seq_length + total, n_features, device=self.device)
+        buf[0, : self.seq_length] = torch.from_numpy(context)
+        buf[0, self.seq_length :] = buf[0, self.seq_length - 1]
+        self.model.eval()
+        model = self._inference_model(n_features)
+        use_bf16 = self.device.type == "cuda" and torch.cuda.is_bf16_supported()
+        with torch.inference_mode():
+            for block in range(n_blocks):
+                pos = block * self.pred_length
+                with torch.autocast(self.device.type, dtype=torch.bfloat16, enabled=use_bf16):
+                    pred = model(buf[:, pos : pos + self.seq_length])
+                start = self.seq_length + pos
+                buf[0, start : start + self.pred_length, self.target_idx] = pred[0].float()
+            scaled = buf[0, self.seq_length : self.seq_length + horizon, self.target_idx]
+            values = scaled.cpu().numpy()
 
-        # TODO: Implement prediction
-        raise NotImplementedError("Implement transformer prediction")
+        predicted = np.clip(values * std[self.target_idx] + mean[self.target_idx], 0.0, None)
+        out = pd.DataFrame({"predicted_occupancy": predicted})
+        if self.zone_id is not None:
+            out.insert(0, "zone_id", self.zone_id)
+        if "timestamp" in df.columns:
+            ts = pd.to_datetime(df["timestamp"])
+            step = pd.Timedelta(self.kwargs.get("freq", ts.iloc[-1] - ts.iloc[-2]))
+            out.insert(0, "timestamp", ts.iloc[-1] + step * np.arange(1, horizon + 1))
+        return out
 
     def evaluate(
         self,
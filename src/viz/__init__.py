@@ -12,27 +12,58 @@ from .dashboard_data import (
     fetch_occupancy_space_stats,
 )
 from .dashboard_insights import derive_hvac_insights, derive_occupancy_insights
+from .savings_report import SavingsSummary, savings_summary_html, write_savings_summary
 try:
     from .dashboards import (
+        clear_heatmap_cache,
+        create_interactive_dashboard,
+        daily_opportunity,
+        draw_heatmap,
+        figure_to_png,
+        heatmap_matrix,
+        narrow_frame,
         plot_daily_opportunity_for_savings,
         plot_occupancy_over_time,
         plot_example_day_timeline,
         plot_occupancy_heatmap,
         plot_savings_summary,
+        plot_zone_heatmaps,
+        read_dashboard_frame,
     )
 except ModuleNotFoundError:  # pragma: no cover - optional visualization deps
+    clear_heatmap_cache = None
+    create_interactive_dashboard = None
+    daily_opportunity = None
+    draw_heatmap = None
+    figure_to_png = None
+    heatmap_matrix = None
+    narrow_frame = None
     plot_daily_opportunity_for_savings = None
     plot_occupancy_over_time = None
     plot_example_day_timeline = None
     plot_occupancy_heatmap = None
     plot_savings_summary = None
+    plot_zone_heatmaps = None
+    read_dashboard_frame = None
 
 __all__ = [
+    "SavingsSummary",
+    "clear_heatmap_cache",
+    "create_interactive_dashboard",
+    "daily_opportunity",
+    "draw_heatmap",
+    "figure_to_png",
+    "heatmap_matrix",
+    "narrow_frame",
     "plot_daily_opportunity_for_savings",
     "plot_occupancy_over_time",
     "plot_example_day_timeline",
     "plot_occupancy_heatmap",
     "plot_savings_summary",
+    "plot_zone_heatmaps",
+    "read_dashboard_frame",
+    "savings_summary_html",
+    "write_savings_summary",
     "fetch_occupancy_kpis",
     "fetch_occupancy_daily",
     "fetch_occupancy_heatmap",
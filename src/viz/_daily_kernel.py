@@ -0,0 +1,141 @@
+"""
+Per-day reduction of "opportunity" energy from interval-level samples.
+
+Each sample contributes power * interval hours to its day's total, and to
+the day's opportunity total when the space is unoccupied. With Numba
+installed this is a single compiled pass; otherwise two `np.bincount` calls
+give the same result. Set HVAC_NUMBA_WARMUP=1 to compile at import time.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - depends on runtime environment
+    njit = None
+
+from src._numba_flags import FASTMATH
+
+try:
+    from src import _hvac_kernels
+except ImportError:  # pragma: no cover - built by scripts/build_numba_kernels.py
+    _hvac_kernels = None
+
+
+def _unoccupied_power(occ, power_kw):
+    return np.where(occ <= 0, power_kw, power_kw.dtype.type(0))
+
+
+def _daily_opportunity_numpy(date_idx, occ, power_kw, dt_h, n_days):
+    # dt_h is constant, so it scales the n_days sums instead of every sample.
+    total = np.bincount(date_idx, weights=power_kw, minlength=n_days) * dt_h
+    opportunity = np.bincount(
+        date_idx, weights=_unoccupied_power(occ, power_kw), minlength=n_days
+    ) * dt_h
+    return opportunity, total
+
+
+def daily_opportunity_reduceat(
+    day_starts: np.ndarray,
+    occ: np.ndarray,
+    power_kw: np.ndarray,
+    dt_h: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return (opportunity_kwh, total_kwh) per day for time-sorted samples.
+
+    `day_starts` holds the index of the first sample of each day, so every
+    day is a contiguous slice and `np.add.reduceat` sums it in one
+    sequential scan with no day codes at all. Sums accumulate in float64.
+    """
+    total = np.add.reduceat(power_kw, day_starts, dtype=np.float64) * dt_h
+    opportunity = np.add.reduceat(
+        _unoccupied_power(occ, power_kw), day_starts, dtype=np.float64
+    ) * dt_h
+    return opportunity, total
+
+
+def _daily_opportunity_loop(date_idx, occ, power_kw, dt_h, n_days):  # pragma: no cover - compiled
+    # Serial on purpose: rows scatter into shared day bins, so a prange loop
+    # would race on the accumulators.
+    opportunity = np.zeros(n_days, dtype=np.float64)
+    total = np.zeros(n_days, dtype=np.float64)
+    for i in range(date_idx.shape[0]):
+        e = power_kw[i] * dt_h
+        total[date_idx[i]] += e
+        if occ[i] <= 0:
+            opportunity[date_idx[i]] += e
+    return opportunity, total
+
+
+if njit is not None:
+    _daily_opportunity_numba = njit(cache=True, fastmath=FASTMATH)(_daily_opportunity_loop)
+else:
+    _daily_opportunity_numba = None
+
+# (occ, power) dtype -> AOT export name; see scripts/build_numba_kernels.py.
+# The narrowed entries cover what dashboards.narrow_frame produces.
+_AOT_DAILY = {
+    (np.dtype(np.float64), np.dtype(np.float64)): "daily_opportunity_sum",
+    (np.dtype(np.uint8), np.dtype(np.float32)): "daily_opportunity_sum_u1f4",
+    (np.dtype(np.uint16), np.dtype(np.float32)): "daily_opportunity_sum_u2f4",
+    (np.dtype(np.float32), np.dtype(np.float32)): "daily_opportunity_sum_f4",
+}
+
+
+def _aot_kernel(occ: np.ndarray, power_kw: np.ndarray):
+    """
+    Return (AOT kernel, occ) for these dtypes, or (None, occ) without one.
+
+    Occupancy dtypes with no export of their own are cast to the power dtype:
+    only the sign of occupancy is read, and the float cast keeps it.
+    """
+    if _hvac_kernels is None or power_kw.dtype.kind != "f":
+        return None, occ
+    name = _AOT_DAILY.get((occ.dtype, power_kw.dtype))
+    if name is None:
+        occ = occ.astype(power_kw.dtype)
+        name = _AOT_DAILY.get((occ.dtype, power_kw.dtype))
+    # Older builds of the AOT module may predate some of these exports.
+    return getattr(_hvac_kernels, name, None) if name else None, occ
+
+
+def daily_opportunity_sum(
+    date_idx: np.ndarray,
+    occ: np.ndarray,
+    power_kw: np.ndarray,
+    dt_h: float,
+    n_days: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return (opportunity_kwh, total_kwh) per day, each of length `n_days`.
+
+    `date_idx` holds each sample's day code in [0, n_days); a sample counts
+    toward opportunity energy when its occupancy is <= 0. Narrow numeric
+    inputs (e.g. int8 counts, float32 power) are used as-is; day totals are
+    always accumulated in float64.
+    """
+    date_idx = np.ascontiguousarray(date_idx, dtype=np.int64)
+    occ = np.ascontiguousarray(occ)
+    power_kw = np.ascontiguousarray(power_kw)
+    aot, aot_occ = _aot_kernel(occ, power_kw)
+    if aot is not None:
+        return aot(date_idx, aot_occ, power_kw, float(dt_h), int(n_days))
+    args = (date_idx, occ, power_kw, float(dt_h), int(n_days))
+    if _daily_opportunity_numba is None:
+        return _daily_opportunity_numpy(*args)
+    return _daily_opportunity_numba(*args)
+
+
+def warmup() -> None:
+    """Compile the Numba kernel on a tiny input so later calls skip JIT cost."""
+    daily_opportunity_sum(np.zeros(1, dtype=np.int64), np.zeros(1), np.zeros(1), 1.0, 1)
+
+
+if os.environ.get("HVAC_NUMBA_WARMUP") == "1":  # pragma: no cover - opt-in
+    warmup()
@@ -0,0 +1,188 @@
+"""
+Streamlit app for exploring a single interval-level DataFrame.
+
+Launched by `create_interactive_dashboard`, which writes the frame as an
+Arrow IPC file (or a pickle without pyarrow) and runs:
+
+    streamlit run src/viz/frame_dashboard.py -- --data /path/to/frame.arrow
+
+Each plot panel is a fragment, so its own zone/date widgets rerun only that
+panel. The expensive reductions are memoized with `st.cache_data`; the frame
+is loaded once per data file with `st.cache_resource`, which keeps its id
+stable across reruns so it can be hashed by (id, len) instead of by content.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+from typing import Any, Optional, Tuple
+
+# Make `src.*` imports work even when streamlit is launched outside repo root.
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.viz.dashboards import (
+    HEATMAP_AGG_FUNCS,
+    daily_opportunity,
+    draw_heatmap,
+    figure_to_png,
+    heatmap_matrix,
+    narrow_frame,
+    plot_daily_opportunity_for_savings,
+    plot_example_day_timeline,
+    read_dashboard_frame,
+)
+
+TIMESTAMP_COL = "timestamp"
+ZONE_COL = "zone_id"
+OCCUPANCY_COL = "occupancy_count"
+POWER_COL = "hvac_power_kw"
+ALL_ZONES = "All zones"
+PREVIEW_ROWS = 10_000
+
+# st.fragment is available from Streamlit 1.37; older releases ship it as
+# experimental_fragment. Without either, panels simply rerun with the page.
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", lambda f: f)
+
+# The frame comes from _load_frame, so its identity is stable for the session.
+_FRAME_HASH = {pd.DataFrame: lambda d: (id(d), len(d))}
+
+
+@st.cache_resource(show_spinner=False)
+def _load_frame(data_path: str) -> Tuple[pd.DataFrame, Optional[Any]]:
+    df, table = read_dashboard_frame(data_path)
+    df[TIMESTAMP_COL] = pd.to_datetime(df[TIMESTAMP_COL], errors="coerce")
+    return df, table
+
+
+@st.cache_data(hash_funcs=_FRAME_HASH, show_spinner=False)
+def _cached_heatmap_matrix(df: pd.DataFrame, zone_id: Optional[Any], agg_func: str) -> np.ndarray:
+    return heatmap_matrix(df, zone_id, agg_func, TIMESTAMP_COL, OCCUPANCY_COL, ZONE_COL)
+
+
+@st.cache_data(hash_funcs=_FRAME_HASH, show_spinner=False)
+def _cached_daily_opportunity(df: pd.DataFrame, zone_id: Optional[Any]) -> pd.DataFrame:
+    if zone_id is not None:
+        df = df[df[ZONE_COL] == zone_id]
+    return daily_opportunity(
+        narrow_frame(df, int_cols=[OCCUPANCY_COL], float_cols=[POWER_COL]),
+        "date",
+        "opportunity_energy_kwh",
+        "total_energy_kwh",
+        TIMESTAMP_COL,
+        OCCUPANCY_COL,
+        POWER_COL,
+        None,
+    )
+
+
+def _zone_select(df: pd.DataFrame, key: str) -> Optional[Any]:
+    """Pick a zone by its string label and return the original column value."""
+    if ZONE_COL not in df.columns:
+        return None
+    zones = {str(zone): zone for zone in df[ZONE_COL].dropna().unique()}
+    choice = st.selectbox("Zone", [ALL_ZONES] + sorted(zones), key=key)
+    return None if choice == ALL_ZONES else zones[choice]
+
+
+def _show(fig: plt.Figure) -> None:
+    # Encoding from the Agg buffer is cheaper than st.pyplot's savefig round trip.
+    st.image(figure_to_png(fig))
+    plt.close(fig)
+
+
+@_fragment
+def _heatmap_panel(df: pd.DataFrame) -> None:
+    st.subheader("Occupancy Heatmap")
+    left, right = st.columns(2)
+    with left:
+        zone_id = _zone_select(df, key="heatmap_zone")
+    with right:
+        agg_func = st.selectbox("Aggregation", HEATMAP_AGG_FUNCS, key="heatmap_agg")
+    matrix = _cached_heatmap_matrix(df, zone_id, agg_func)
+    _show(draw_heatmap(matrix, zone_id, agg_func, figsize=(12, 6)))
+
+
+@_fragment
+def _daily_panel(df: pd.DataFrame) -> None:
+    st.subheader("Daily Opportunity for Savings")
+    if POWER_COL not in df.columns:
+        st.info(f"Column `{POWER_COL}` is required for the daily opportunity panel.")
+        return
+    zone_id = _zone_select(df, key="daily_zone")
+    daily = _cached_daily_opportunity(df, zone_id)
+    if daily.empty:
+        st.info("No data for the selected zone.")
+        return
+    _show(plot_daily_opportunity_for_savings(daily))
+
+
+@_fragment
+def _timeline_panel(df: pd.DataFrame) -> None:
+    st.subheader("Example Day")
+    timestamps = df[TIMESTAMP_COL].dropna()
+    if timestamps.empty:
+        st.info("No valid timestamps.")
+        return
+    left, right = st.columns(2)
+    with left:
+        zone_id = _zone_select(df, key="timeline_zone")
+    with right:
+        day = st.date_input(
+            "Date",
+            value=timestamps.min().date(),
+            min_value=timestamps.min().date(),
+            max_value=timestamps.max().date(),
+            key="timeline_date",
+        )
+    try:
+        fig = plot_example_day_timeline(df, str(day), zone_id=zone_id)
+    except ValueError as exc:
+        st.info(str(exc))
+        return
+    _show(fig)
+
+
+def _data_panel(df: pd.DataFrame, table: Optional[Any]) -> None:
+    st.subheader("Data")
+    st.caption(f"First {min(PREVIEW_ROWS, len(df)):,} of {len(df):,} rows")
+    # An Arrow table goes to the frontend without a pandas round trip.
+    st.dataframe(table.slice(0, PREVIEW_ROWS) if table is not None else df.head(PREVIEW_ROWS))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", required=True, help="Arrow IPC or pickled DataFrame to explore")
+    args = parser.parse_args()
+
+    st.set_page_config(page_title="HVAC Occupancy Explorer", page_icon="🏢", layout="wide")
+    st.title("HVAC Occupancy Explorer")
+
+    df, table = _load_frame(args.data)
+    st.caption(f"{len(df):,} rows from `{args.data}`")
+
+    tabs = st.tabs(["Heatmap", "Daily Opportunity", "Example Day", "Data"])
+    with tabs[0]:
+        _heatmap_panel(df)
+    with tabs[1]:
+        _daily_panel(df)
+    with tabs[2]:
+        _timeline_panel(df)
+    with tabs[3]:
+        _data_panel(df, table)
+
+
+if __name__ == "__main__":
+    main()
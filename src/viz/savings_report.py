@@ -0,0 +1,204 @@
+"""
+Static HTML rendering of savings summaries.
+
+Kept free of matplotlib so batch report generators can render summaries
+without paying for the plotting stack: the output is a self-contained HTML
+fragment with the key metrics and an inline SVG pie chart.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import html
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    import imgkit
+except ImportError:  # pragma: no cover - optional dependency
+    imgkit = None
+
+PIE_COLORS = ("#2E86AB", "#A23B72", "#F18F01", "#C73E1D", "#3B1F2B", "#6B9080")
+_PIE_RADIUS = 90.0
+
+
+@dataclass(frozen=True, slots=True)
+class SavingsSummary:
+    """
+    Fixed-schema savings metrics for rendering.
+
+    `breakdown` holds (label, kWh) pairs for the pie chart, e.g. savings
+    by time period; optional metrics are None when the analysis did not
+    produce them.
+    """
+
+    energy_savings_kwh: float
+    baseline_energy_kwh: Optional[float] = None
+    cost_savings: Optional[float] = None
+    energy_savings_pct: Optional[float] = None
+    setback_hours: Optional[float] = None
+    breakdown: Tuple[Tuple[str, float], ...] = ()
+
+    @classmethod
+    def from_dict(cls, savings: Mapping[str, object]) -> "SavingsSummary":
+        """
+        Adapt the summary dicts returned by `compute_savings_and_setpoints`
+        (total_energy_savings, total_cost_savings) and
+        `simulate_control_policy` (energy_savings_kwh, cost_savings).
+        """
+        breakdown = savings.get("breakdown") or {}
+        return cls(
+            energy_savings_kwh=_first(savings, "total_energy_savings", "energy_savings_kwh") or 0.0,
+            baseline_energy_kwh=_first(savings, "baseline_energy_kwh"),
+            cost_savings=_first(savings, "total_cost_savings", "cost_savings"),
+            energy_savings_pct=_first(savings, "energy_savings_pct"),
+            setback_hours=_first(savings, "setback_hours"),
+            breakdown=tuple((str(k), float(v)) for k, v in dict(breakdown).items()),
+        )
+
+
+def _first(savings: Mapping[str, object], *keys: str) -> Optional[float]:
+    for key in keys:
+        if savings.get(key) is not None:
+            return float(savings[key])
+    return None
+
+
+def _as_summary(savings: Union[SavingsSummary, Mapping[str, object]]) -> SavingsSummary:
+    return savings if isinstance(savings, SavingsSummary) else SavingsSummary.from_dict(savings)
+
+
+def _breakdown(summary: SavingsSummary) -> Dict[str, float]:
+    """Pie slices: the explicit breakdown, else saved vs. remaining energy."""
+    if summary.breakdown:
+        return dict(summary.breakdown)
+    if summary.baseline_energy_kwh is None:
+        return {}
+    saved = summary.energy_savings_kwh
+    return {"Saved": saved, "Remaining": max(summary.baseline_energy_kwh - saved, 0.0)}
+
+
+def _pie_svg(slices: Dict[str, float], size: int) -> str:
+    values = np.clip(np.fromiter(slices.values(), dtype=float, count=len(slices)), 0.0, None)
+    total = values.sum()
+    if not len(values) or total <= 0:
+        return ""
+
+    c = size / 2.0
+    r = min(_PIE_RADIUS, c - 5.0)
+    # Slice boundaries as angles, clockwise from 12 o'clock.
+    angles = np.concatenate(([0.0], np.cumsum(values / total))) * 2 * np.pi - np.pi / 2
+    xs = c + r * np.cos(angles)
+    ys = c + r * np.sin(angles)
+
+    shapes = []
+    for i, value in enumerate(values):
+        color = PIE_COLORS[i % len(PIE_COLORS)]
+        if value == total:
+            shapes.append(f'<circle cx="{c:.2f}" cy="{c:.2f}" r="{r:.2f}" fill="{color}"/>')
+        elif value > 0:
+            large_arc = int(angles[i + 1] - angles[i] > np.pi)
+            shapes.append(
+                f'<path d="M {c:.2f} {c:.2f} L {xs[i]:.2f} {ys[i]:.2f} '
+                f'A {r:.2f} {r:.2f} 0 {large_arc} 1 {xs[i + 1]:.2f} {ys[i + 1]:.2f} Z" '
+                f'fill="{color}"/>'
+            )
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+        f'viewBox="0 0 {size} {size}">{"".join(shapes)}</svg>'
+    )
+
+
+def _legend_html(slices: Dict[str, float]) -> str:
+    total = sum(max(v, 0.0) for v in slices.values()) or 1.0
+    items = []
+    for i, (label, value) in enumerate(slices.items()):
+        color = PIE_COLORS[i % len(PIE_COLORS)]
+        items.append(
+            f'<li><span style="display:inline-block;width:10px;height:10px;'
+            f'background:{color};margin-right:6px"></span>'
+            f'{html.escape(label)}: {value:,.1f} kWh ({100.0 * max(value, 0.0) / total:.0f}%)</li>'
+        )
+    return f'<ul style="list-style:none;padding:0;margin:8px 0 0">{"".join(items)}</ul>'
+
+
+def savings_summary_html(
+    savings: Union[SavingsSummary, Mapping[str, object]],
+    title: str = "HVAC Savings Summary",
+    figsize: Tuple[int, int] = (10, 6),
+) -> str:
+    """
+    Render a savings summary as a self-contained HTML fragment.
+
+    Accepts a `SavingsSummary` or one of the optimizer summary dicts (see
+    `SavingsSummary.from_dict`). An optional `breakdown` (label -> kWh,
+    e.g. savings by time period) drives the pie chart; without it the pie
+    shows saved vs. remaining baseline energy.
+
+    Args:
+        savings: Savings metrics from analysis.
+        title: Heading for the summary.
+        figsize: Width and height in inches at 100 px per inch.
+
+    Returns:
+        HTML string.
+    """
+    summary = _as_summary(savings)
+    pct, cost, baseline, hours = (
+        summary.energy_savings_pct,
+        summary.cost_savings,
+        summary.baseline_energy_kwh,
+        summary.setback_hours,
+    )
+    metrics = [
+        ("Energy Savings", f"{summary.energy_savings_kwh:,.1f} kWh"),
+        ("Cost Savings", None if cost is None else f"${cost:,.2f}"),
+        ("Baseline Energy", None if baseline is None else f"{baseline:,.1f} kWh"),
+        ("Savings vs. Baseline", None if pct is None else f"{pct:.1f}%"),
+        ("Setback Hours", None if hours is None else f"{hours:,.1f} h"),
+    ]
+    metric_divs = "".join(
+        f'<div style="flex:1 1 150px;padding:12px;border:1px solid #ddd;border-radius:6px">'
+        f'<div style="font-size:12px;color:#666">{label}</div>'
+        f'<div style="font-size:22px;font-weight:bold">{value}</div></div>'
+        for label, value in metrics
+        if value is not None
+    )
+
+    width, height = (int(v * 100) for v in figsize)
+    slices = _breakdown(summary)
+    pie = _pie_svg(slices, size=min(height - 80, width // 2, 240))
+    pie_block = f'<div style="margin-top:16px">{pie}{_legend_html(slices)}</div>' if pie else ""
+
+    return (
+        f'<div class="savings-summary" style="font-family:sans-serif;max-width:{width}px">'
+        f'<h2 style="margin:0 0 12px">{html.escape(title)}</h2>'
+        f'<div style="display:flex;flex-wrap:wrap;gap:12px">{metric_divs}</div>'
+        f"{pie_block}</div>"
+    )
+
+
+def write_savings_summary(
+    savings: Union[SavingsSummary, Mapping[str, object]],
+    output_path: Union[str, Path],
+    title: str = "HVAC Savings Summary",
+    figsize: Tuple[int, int] = (10, 6),
+) -> Path:
+    """
+    Write `savings_summary_html` to `output_path`.
+
+    A `.png` suffix renders the HTML with imgkit (wkhtmltoimage); any other
+    suffix writes the HTML as a standalone page.
+    """
+    output_path = Path(output_path)
+    markup = savings_summary_html(savings, title=title, figsize=figsize)
+    page = f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"></head><body>{markup}</body></html>"
+    if output_path.suffix.lower() == ".png":
+        if imgkit is None:
+            raise ImportError("PNG export requires imgkit (pip install imgkit) and wkhtmltoimage")
+        imgkit.from_string(page, str(output_path), options={"width": int(figsize[0] * 100)})
+    else:
+        output_path.write_text(page, encoding="utf-8")
+    return output_path
@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.control.optimizer import compute_savings_and_setpoints, simulate_control_policy
+
+
+def test_occupancy_setback_leaves_room_for_pre_conditioning():
+    ts = pd.date_range("2025-01-01 00:00:00", periods=8, freq="15min")
+    df = pd.DataFrame(
+        {
+            "timestamp": ts,
+            "zone_id": "A",
+            "occupancy_count": [0, 0, 0, 0, 0, 4, 4, 0],
+            "baseline_setpoint": 72.0,
+            "energy_kwh": 1.0,
+            "tou_rate": 0.2,
+        }
+    )
+
+    out, summary = simulate_control_policy(df, policy_params={"pre_condition_time": 30})
+
+    # Two steps (30 min) before occupancy resume at baseline; the trailing
+    # empty step has no occupancy ahead and is set back.
+    assert out["is_setback"].tolist() == [True, True, True, False, False, False, False, True]
+    assert out.loc[0, "simulated_setpoint"] == 76.0
+    assert summary["energy_savings_kwh"] == pytest.approx(4 * 0.3)
+    assert summary["cost_savings"] == pytest.approx(4 * 0.3 * 0.2)
+    assert summary["setback_hours"] == 1.0
+
+
+def test_compute_savings_and_setpoints_masks_setback_by_season():
+    ts = pd.date_range("2025-01-06 00:00:00", periods=6, freq="15min")
+    forecast = pd.DataFrame(
+        {
+            "timestamp": list(ts) * 2,
+            "zone_id": ["A"] * 6 + ["B"] * 6,
+            "predicted_occupancy": [0, 0, 0, 0, 3, 0] * 2,
+        }
+    )
+    baseline = forecast[["timestamp", "zone_id"]].assign(
+        baseline_setpoint=[72.0] * 6 + [68.0] * 6,
+        baseline_energy=2.0,
+        hvac_on=[True, False, True, True, True, True] * 2,
+        hvac_mode=["cooling"] * 6 + ["heating"] * 6,
+    )
+    tou = pd.DataFrame({"start_hour": [0], "end_hour": [24], "rate_kwh": [0.25]})
+
+    out, summary = compute_savings_and_setpoints(
+        forecast, baseline, tou_rates=tou, comfort_constraints={"pre_condition_time": 15}
+    )
+
+    expected = [True, False, True, False, False, True]
+    assert out["is_setback"].tolist() == expected * 2
+    assert out["recommended_setpoint"].tolist() == [76, 72, 76, 72, 72, 76] + [64, 68, 64, 68, 68, 64]
+    assert out["recommended_setpoint"].dtype == np.float32
+    assert summary["total_energy_savings"] == pytest.approx(6 * 2.0 * 0.3)
+    assert summary["total_cost_savings"] == pytest.approx(6 * 2.0 * 0.3 * 0.25)
+
+
+def test_setback_policies_agree_on_season_sign_and_missing_occupancy():
+    ts = pd.date_range("2025-01-06 00:00:00", periods=6, freq="15min")
+    frame = pd.DataFrame(
+        {
+            "timestamp": list(ts) * 2,
+            "zone_id": ["A"] * 6 + ["B"] * 6,
+            "predicted_occupancy": [0, 0, np.nan, 0, 0, 0] * 2,
+            "baseline_setpoint": [72.0] * 6 + [68.0] * 6,
+            "baseline_energy": 2.0,
+            "hvac_mode": ["cooling"] * 6 + ["heating"] * 6,
+        }
+    )
+    # A negative delta is read as a magnitude by both policies.
+    params = {"pre_condition_time": 15, "setback_delta": -4.0}
+
+    planned, _ = compute_savings_and_setpoints(
+        frame[["timestamp", "zone_id", "predicted_occupancy"]],
+        frame.drop(columns="predicted_occupancy"),
+        comfort_constraints=params,
+    )
+    simulated, _ = simulate_control_policy(
+        frame,
+        policy="predictive_setback",
+        policy_params={**params, "energy_col": "baseline_energy"},
+    )
+
+    # The missing forecast is treated as occupied, so the step before it
+    # stays at baseline for pre-conditioning.
+    expected = [True, False, False, True, True, True]
+    assert planned["is_setback"].tolist() == expected * 2
+    assert simulated["is_setback"].tolist() == expected * 2
+    np.testing.assert_allclose(
+        simulated["simulated_setpoint"], planned["recommended_setpoint"].astype(float)
+    )
+    assert planned["recommended_setpoint"].tolist() == [76, 72, 72, 76, 76, 76] + [64, 68, 68, 64, 64, 64]
+
+
+def test_setback_policies_agree_on_setback_hours_when_hvac_is_off():
+    ts = pd.date_range("2025-01-06 00:00:00", periods=8, freq="15min")
+    frame = pd.DataFrame(
+        {
+            "timestamp": ts,
+            "zone_id": "A",
+            "predicted_occupancy": [0, 0, 0, 0, 0, 0, 4, 0],
+            "baseline_setpoint": 72.0,
+            "baseline_energy": 2.0,
+            "hvac_on": [True, False, False, True, False, True, True, False],
+        }
+    )
+    params = {"pre_condition_time": 15}
+
+    planned, planned_summary = compute_savings_and_setpoints(
+        frame[["timestamp", "zone_id", "predicted_occupancy"]],
+        frame.drop(columns="predicted_occupancy"),
+        comfort_constraints=params,
+    )
+    simulated, simulated_summary = simulate_control_policy(
+        frame,
+        policy="predictive_setback",
+        policy_params={**params, "energy_col": "baseline_energy"},
+    )
+
+    assert planned["is_setback"].tolist() == [True, False, False, True, False, False, False, False]
+    assert simulated["is_setback"].tolist() == planned["is_setback"].tolist()
+    assert simulated_summary["setback_hours"] == planned_summary["setback_hours"] == 0.5
+    assert simulated_summary["energy_savings_kwh"] == pytest.approx(
+        planned_summary["total_energy_savings"]
+    )
+
+
+def test_compute_savings_rejects_zone_id_on_one_side_only():
+    ts = pd.date_range("2025-01-06 00:00:00", periods=4, freq="15min")
+    forecast = pd.DataFrame({"timestamp": ts, "predicted_occupancy": 0})
+    baseline = pd.DataFrame(
+        {
+            "timestamp": list(ts) * 2,
+            "zone_id": ["A"] * 4 + ["B"] * 4,
+            "baseline_setpoint": 72.0,
+            "baseline_energy": 1.0,
+        }
+    )
+
+    with pytest.raises(ValueError, match="zone_id"):
+        compute_savings_and_setpoints(forecast, baseline)
+    with pytest.raises(ValueError, match="zone_id"):
+        compute_savings_and_setpoints(
+            baseline[["timestamp", "zone_id"]].assign(predicted_occupancy=0),
+            baseline.drop(columns="zone_id"),
+        )
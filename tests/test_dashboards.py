@@ -0,0 +1,383 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.dates
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
+dashboards = pytest.importorskip("src.viz.dashboards")
+
+
+def _occupancy_frame() -> pd.DataFrame:
+    ts = pd.date_range("2025-01-06 00:00:00", periods=14 * 24 * 4, freq="15min")  # starts Monday
+    occ = np.where((ts.hour >= 9) & (ts.hour < 17) & (ts.dayofweek < 5), 10.0, 0.0)
+    occ[5] = np.nan
+    return pd.DataFrame(
+        {
+            "timestamp": np.tile(ts, 2),
+            "zone_id": np.repeat(["A", "B"], len(ts)),
+            "occupancy_count": np.concatenate([occ, occ * 2]),
+        }
+    )
+
+
+@pytest.mark.parametrize("agg_func", ["mean", "median", "max"])
+def test_heatmap_matrix_matches_pandas_fallback(monkeypatch, agg_func):
+    df = _occupancy_frame()
+    matrix = dashboards.heatmap_matrix(df, "B", agg_func, "timestamp", "occupancy_count", "zone_id")
+    monkeypatch.setattr(dashboards, "pl", None)
+    dashboards.clear_heatmap_cache(df)
+    fallback = dashboards.heatmap_matrix(df, "B", agg_func, "timestamp", "occupancy_count", "zone_id")
+
+    assert matrix.shape == (24, 7)
+    np.testing.assert_allclose(matrix, fallback)
+    assert matrix[10, 0] == 20.0  # Monday 10:00
+    assert matrix[10, 6] == 0.0  # Sunday 10:00
+
+
+def test_plot_occupancy_heatmap_returns_figure():
+    fig = dashboards.plot_occupancy_heatmap(_occupancy_frame(), zone_id="A")
+    assert fig.axes[0].images[0].get_array().shape == (24, 7)
+    plt.close(fig)
+
+    with pytest.raises(ValueError):
+        dashboards.plot_occupancy_heatmap(_occupancy_frame(), agg_func="sum")
+
+
+def test_daily_opportunity_reduces_interval_samples():
+    ts = pd.date_range("2025-01-06 00:00:00", periods=2 * 96, freq="15min")
+    df = pd.DataFrame(
+        {
+            "timestamp": ts,
+            "occupancy_count": np.where(ts.hour < 12, 0, 3),
+            "hvac_power_kw": 4.0,
+        }
+    )
+
+    daily = dashboards.daily_opportunity(
+        df, "date", "opp", "total", "timestamp", "occupancy_count", "hvac_power_kw", None
+    )
+
+    assert daily["date"].tolist() == [pd.Timestamp("2025-01-06"), pd.Timestamp("2025-01-07")]
+    np.testing.assert_allclose(daily["opp"], [48.0, 48.0])
+    np.testing.assert_allclose(daily["total"], [96.0, 96.0])
+
+    fig = dashboards.plot_daily_opportunity_for_savings(df)
+    (bars,) = fig.axes[0].collections
+    assert len(bars.get_paths()) == 2
+    assert fig.axes[0].get_legend_handles_labels()[1] == ["Opportunity for Savings"]
+    plt.close(fig)
+
+
+def test_daily_opportunity_plot_uses_float_dates_for_bars_and_line():
+    dates = pd.date_range("2025-01-01", periods=5, freq="D")
+    daily = pd.DataFrame(
+        {"date": dates[::-1], "opportunity_energy_kwh": [5.0, 4.0, 3.0, 2.0, 1.0], "total_energy_kwh": 10.0}
+    )
+
+    fig = dashboards.plot_daily_opportunity_for_savings(daily)
+    (line,) = fig.axes[1].get_lines()
+
+    np.testing.assert_allclose(line.get_xdata(), matplotlib.dates.date2num(dates.to_numpy()))
+    np.testing.assert_allclose(line.get_ydata(), [1.0, 3.0, 6.0, 10.0, 15.0])
+    assert isinstance(fig.axes[0].xaxis.get_major_formatter(), matplotlib.dates.ConciseDateFormatter)
+    plt.close(fig)
+
+
+def test_day_rows_slices_sorted_and_unsorted_frames():
+    df = _occupancy_frame().sort_values("timestamp", kind="stable").reset_index(drop=True)
+
+    rows = dashboards._day_rows(df, "2025-01-07", "timestamp", "B", "zone_id")
+    day = df.iloc[rows]
+    assert len(day) == 96
+    assert (day["zone_id"] == "B").all()
+    assert (day["timestamp"].dt.date == pd.Timestamp("2025-01-07").date()).all()
+
+    shuffled = df.sample(frac=1.0, random_state=0)
+    unsorted_rows = dashboards._day_rows(shuffled, "2025-01-07", "timestamp", "B", "zone_id")
+    assert list(shuffled.index[unsorted_rows]) == list(day.index)  # time order
+
+
+def test_plot_example_day_timeline_orders_unsorted_frames_by_time():
+    df = _occupancy_frame().assign(hvac_on=True, energy_kwh=1.0).sample(frac=1.0, random_state=0)
+    fig = dashboards.plot_example_day_timeline(df, "2025-01-07", zone_id="A")
+    for ax in fig.axes:
+        x = matplotlib.dates.date2num(ax.get_lines()[0].get_xdata())
+        assert np.all(np.diff(x) >= 0)
+    plt.close(fig)
+
+
+def test_plot_example_day_timeline_has_three_panels():
+    df = _occupancy_frame().assign(hvac_on=True, energy_kwh=1.0)
+    fig = dashboards.plot_example_day_timeline(df, "2025-01-07", zone_id="A")
+    assert len(fig.axes) == 3
+    boxes = [ax.get_position() for ax in fig.axes]
+    assert all(0 < box.x0 < box.x1 < 1 and 0 < box.y0 < box.y1 < 1 for box in boxes)
+    assert boxes[0].y0 > boxes[1].y1 and boxes[1].y0 > boxes[2].y1  # stacked, no overlap
+    assert fig.axes[0].get_shared_x_axes().joined(fig.axes[0], fig.axes[2])
+    plt.close(fig)
+
+    with pytest.raises(ValueError):
+        dashboards.plot_example_day_timeline(df, "2030-01-01")
+
+
+def test_plot_example_day_timeline_labels_tz_aware_frames_in_local_time():
+    ts = pd.date_range("2025-01-07", periods=96, freq="15min", tz="America/New_York")
+    df = pd.DataFrame({"timestamp": ts, "occupancy_count": 0, "hvac_on": True, "energy_kwh": 1.0})
+    fig = dashboards.plot_example_day_timeline(df, "2025-01-07")
+    x = matplotlib.dates.date2num(fig.axes[2].get_lines()[0].get_xdata())
+    formatter = fig.axes[2].xaxis.get_major_formatter()
+    assert formatter(x[0]) == "00:00"
+    assert formatter(x[-1]) == "23:45"
+    plt.close(fig)
+
+
+def test_plot_example_day_timeline_rasterizes_only_dense_days():
+    df = _occupancy_frame().assign(hvac_on=True, energy_kwh=1.0)
+    sparse = dashboards.plot_example_day_timeline(df, "2025-01-07", zone_id="A")
+    assert not any(line.get_rasterized() for line in sparse.axes[0].get_lines())
+    plt.close(sparse)
+
+    ts = pd.date_range("2025-01-07", periods=86400 // 10, freq="10s")
+    dense_df = pd.DataFrame({"timestamp": ts, "occupancy_count": 0, "hvac_on": True, "energy_kwh": 1.0})
+    dense = dashboards.plot_example_day_timeline(dense_df, "2025-01-07")
+    assert all(line.get_rasterized() for ax in dense.axes for line in ax.get_lines())
+    plt.close(dense)
+
+
+def test_run_edges_and_opportunity_spans():
+    starts, ends = dashboards._run_edges(np.array([True, True, False, True, False, False, True]))
+    np.testing.assert_array_equal(starts, [0, 3, 6])
+    np.testing.assert_array_equal(ends, [2, 4, 7])
+    assert [len(edge) for edge in dashboards._run_edges(np.zeros(3, dtype=bool))] == [0, 0]
+
+    df = _occupancy_frame().assign(hvac_on=True, energy_kwh=1.0)
+    fig = dashboards.plot_example_day_timeline(df, "2025-01-07", zone_id="A")
+    day = df[(df["zone_id"] == "A") & (df["timestamp"].dt.date == pd.Timestamp("2025-01-07").date())]
+    n_runs = len(dashboards._run_edges(day["occupancy_count"].fillna(0).to_numpy() <= 0)[0])
+    assert len(fig.axes[2].patches) == n_runs
+    plt.close(fig)
+
+    # Run detection needs time-ordered rows; a shuffled frame gives the same spans.
+    shuffled = dashboards.plot_example_day_timeline(
+        df.sample(frac=1.0, random_state=1), "2025-01-07", zone_id="A"
+    )
+    assert len(shuffled.axes[2].patches) == n_runs == 2
+    plt.close(shuffled)
+
+
+def test_narrow_downcasts_counts_losslessly_and_energy_to_float32():
+    df = pd.DataFrame(
+        {
+            "occupancy_count": [0, 12, 250],
+            "sparse_count": [1.0, np.nan, 3.0],
+            "energy_kwh": [0.1, 2.5, 10.0],
+            "label": ["a", "b", "c"],
+        }
+    )
+
+    out = dashboards.narrow_frame(
+        df, int_cols=["occupancy_count", "sparse_count", "missing"], float_cols=["energy_kwh"]
+    )
+
+    assert out["occupancy_count"].dtype == np.uint8
+    assert out["occupancy_count"].tolist() == [0, 12, 250]
+    assert out["sparse_count"].dtype == np.float32
+    assert out["energy_kwh"].dtype == np.float32
+    np.testing.assert_allclose(out["energy_kwh"], df["energy_kwh"], rtol=1e-6)
+    assert df["occupancy_count"].dtype == np.int64
+
+
+def test_heatmap_reuses_cached_calendar_arrays_and_skips_missing_timestamps():
+    df = _occupancy_frame()
+    df.loc[0, "timestamp"] = pd.NaT
+
+    first = dashboards.heatmap_matrix(df, None, "max", "timestamp", "occupancy_count", "zone_id")
+    hour, dow, valid = dashboards._hour_dow(df, "timestamp")
+    second = dashboards.heatmap_matrix(df, "A", "max", "timestamp", "occupancy_count", "zone_id")
+
+    assert hour.dtype == dow.dtype == np.int8
+    assert not valid[0] and valid[1:].all()
+    assert dashboards._hour_dow(df, "timestamp")[0] is hour
+    assert first[10, 0] == 20.0 and second[10, 0] == 10.0
+
+
+@pytest.mark.parametrize("agg_func", ["mean", "median", "max"])
+def test_heatmap_matrix_matches_pivot_table(agg_func):
+    rng = np.random.default_rng(0)
+    ts = pd.date_range("2025-01-06 00:00:00", periods=3000, freq="37min")
+    df = pd.DataFrame({"timestamp": ts, "zone_id": "A", "occupancy_count": rng.integers(0, 30, len(ts))})
+
+    matrix = dashboards.heatmap_matrix(df, None, agg_func, "timestamp", "occupancy_count", "zone_id")
+    expected = df.pivot_table(
+        index=ts.hour, columns=ts.dayofweek, values="occupancy_count", aggfunc=agg_func
+    ).reindex(index=range(24), columns=range(7))
+
+    np.testing.assert_allclose(matrix, expected.to_numpy(dtype=float))
+
+
+@pytest.mark.parametrize("use_arrow", [True, False])
+def test_interactive_dashboard_serves_frame_app_on_port(monkeypatch, use_arrow):
+    if use_arrow:
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(dashboards, "pa", None)
+    df = _occupancy_frame().assign(energy_kwh=1.5)
+    calls = []
+
+    def fake_run(cmd, check):
+        data_path = cmd[cmd.index("--data") + 1]
+        calls.append((cmd, data_path, dashboards.read_dashboard_frame(data_path)))
+
+    monkeypatch.setattr(dashboards.importlib.util, "find_spec", lambda name: object())
+    monkeypatch.setattr(dashboards.subprocess, "run", fake_run)
+    dashboards.create_interactive_dashboard(df, port=8123)
+
+    (cmd, data_path, (served, table)), = calls
+    assert cmd[cmd.index("run") + 1].endswith("frame_dashboard.py")
+    assert cmd[cmd.index("--server.port") + 1] == "8123"
+    assert data_path.endswith(".arrow" if use_arrow else ".pkl")
+    assert (table is not None) == use_arrow
+    assert served["energy_kwh"].dtype == np.float32  # narrowed before the handoff
+    pd.testing.assert_frame_equal(served, df, check_dtype=False)
+
+
+@pytest.mark.parametrize("agg_func", ["mean", "max"])
+def test_heatmap_bincount_skips_missing_occupancy(agg_func):
+    rng = np.random.default_rng(1)
+    ts = pd.date_range("2025-01-06 00:00:00", periods=3000, freq="37min")
+    occ = rng.integers(0, 30, len(ts)).astype(float)
+    occ[rng.random(len(ts)) < 0.2] = np.nan
+    occ[(ts.hour == 3) & (ts.dayofweek == 2)] = np.nan  # one cell with no valid samples
+    df = pd.DataFrame({"timestamp": ts, "zone_id": "A", "occupancy_count": occ})
+
+    matrix = dashboards.heatmap_matrix(df, None, agg_func, "timestamp", "occupancy_count", "zone_id")
+    expected = df.pivot_table(
+        index=ts.hour, columns=ts.dayofweek, values="occupancy_count", aggfunc=agg_func
+    ).reindex(index=range(24), columns=range(7))
+
+    np.testing.assert_allclose(matrix, expected.to_numpy(dtype=float))
+    assert np.isnan(matrix[3, 2])
+
+
+def test_daily_kernel_numpy_fallback_matches_loop():
+    from src.viz import _daily_kernel
+
+    rng = np.random.default_rng(2)
+    date_idx = np.sort(rng.integers(0, 5, 500))
+    occ = rng.integers(0, 3, 500).astype(np.uint8)
+    power = rng.random(500).astype(np.float32)
+
+    opportunity, total = _daily_kernel._daily_opportunity_numpy(date_idx, occ, power, 0.25, 5)
+    expected = _daily_kernel._daily_opportunity_loop(date_idx, occ, power, 0.25, 5)
+
+    np.testing.assert_allclose(opportunity, expected[0], rtol=1e-6)
+    np.testing.assert_allclose(total, expected[1], rtol=1e-6)
+
+
+def test_daily_kernel_routes_narrowed_dtypes_to_aot_exports(monkeypatch):
+    from types import SimpleNamespace
+
+    from src.viz import _daily_kernel
+
+    calls = []
+
+    def export(name):
+        def run(date_idx, occ, power_kw, dt_h, n_days):
+            calls.append((name, occ.dtype))
+            return _daily_kernel._daily_opportunity_numpy(date_idx, occ, power_kw, dt_h, n_days)
+
+        return run
+
+    monkeypatch.setattr(
+        _daily_kernel,
+        "_hvac_kernels",
+        SimpleNamespace(**{name: export(name) for name in _daily_kernel._AOT_DAILY.values()}),
+    )
+    date_idx = np.array([0, 0, 1, 1])
+    power = np.array([1.0, 2.0, 3.0, 4.0], dtype=np.float32)
+    for occ_dtype in (np.uint8, np.uint16, np.uint32, np.float32):
+        occ = np.array([0, 1, 0, 2], dtype=occ_dtype)
+        opportunity, total = _daily_kernel.daily_opportunity_sum(date_idx, occ, power, 0.5, 2)
+        np.testing.assert_allclose(opportunity, [0.5, 1.5])
+        np.testing.assert_allclose(total, [1.5, 3.5])
+
+    assert calls == [
+        ("daily_opportunity_sum_u1f4", np.dtype(np.uint8)),
+        ("daily_opportunity_sum_u2f4", np.dtype(np.uint16)),
+        ("daily_opportunity_sum_f4", np.dtype(np.float32)),
+        ("daily_opportunity_sum_f4", np.dtype(np.float32)),
+    ]
+
+
+def test_zone_heatmaps_match_single_zone_matrices_on_shared_scale():
+    df = _occupancy_frame()
+    matrices = dashboards._zone_heatmap_matrices(
+        df, ["A", "B"], "mean", "timestamp", "occupancy_count", "zone_id", n_jobs=2
+    )
+    for zone_id, matrix in matrices.items():
+        expected = dashboards.heatmap_matrix(df, zone_id, "mean", "timestamp", "occupancy_count", "zone_id")
+        np.testing.assert_array_equal(matrix, expected)
+
+    fig = dashboards.plot_zone_heatmaps(df, agg_func="max", n_jobs=2)
+    images = [ax.images[0] for ax in fig.axes if ax.images]
+    assert [ax.get_title() for ax in fig.axes if ax.images] == ["A", "B"]
+    assert images[0].get_clim() == images[1].get_clim() == (0.0, 20.0)
+    plt.close(fig)
+
+
+@pytest.mark.parametrize("use_pillow", [True, False])
+def test_figure_to_png_renders_at_requested_dpi(tmp_path, monkeypatch, use_pillow):
+    if not use_pillow:
+        monkeypatch.setattr(dashboards, "Image", None)
+    fig, ax = plt.subplots(figsize=(4, 3), dpi=50)
+    ax.plot([0, 1], [0, 1])
+
+    png = dashboards.figure_to_png(fig, path=tmp_path / "fig.png", dpi=100)
+
+    assert png.startswith(b"\x89PNG")
+    assert (tmp_path / "fig.png").read_bytes() == png
+    width, height = int.from_bytes(png[16:20], "big"), int.from_bytes(png[20:24], "big")
+    assert (width, height) == (400, 300)
+    assert fig.dpi == 50
+    plt.close(fig)
+
+
+def test_heatmap_matrix_is_cached_per_frame_until_cleared():
+    df = _occupancy_frame()
+    args = ("A", "mean", "timestamp", "occupancy_count", "zone_id")
+    first = dashboards.heatmap_matrix(df, *args)
+
+    assert dashboards.heatmap_matrix(df, *args) is first
+    assert not first.flags.writeable
+    assert dashboards.heatmap_matrix(df, "A", "max", *args[2:]) is not first
+
+    df["occupancy_count"] *= 2  # in-place edit keeps id and length
+    assert dashboards.heatmap_matrix(df, *args) is first
+    dashboards.clear_heatmap_cache(df)
+    refreshed = dashboards.heatmap_matrix(df, *args)
+    assert refreshed[10, 0] == 2 * first[10, 0]
+
+
+@pytest.mark.parametrize("tz", [None, "America/New_York"])
+def test_daily_opportunity_sorted_reduceat_matches_unsorted_path(tz):
+    rng = np.random.default_rng(3)
+    ts = pd.date_range("2025-03-01", periods=20 * 96, freq="15min", tz=tz)  # spans a DST change
+    df = pd.DataFrame(
+        {
+            "timestamp": ts,
+            "occupancy_count": rng.integers(0, 3, len(ts)),
+            "hvac_power_kw": rng.random(len(ts)),
+        }
+    )
+    args = ("date", "opp", "total", "timestamp", "occupancy_count", "hvac_power_kw", None)
+
+    fast = dashboards.daily_opportunity(df, *args)
+    slow = dashboards.daily_opportunity(df.sample(frac=1.0, random_state=0), *args)
+
+    assert dashboards._is_time_sorted(df, "timestamp")
+    assert (fast["date"].to_numpy() == slow["date"].to_numpy()).all()
+    np.testing.assert_allclose(fast[["opp", "total"]], slow[["opp", "total"]])
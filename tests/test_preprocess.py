@@ -1,6 +1,23 @@
+import numpy as np
 import pandas as pd
+import pytest
 
-from src.data.preprocess import prepare_occupancy_forecast_dataset
+from src.data._opportunity_kernel import (
+    _opportunity_numpy,
+    opportunity,
+    opportunity_bits_from_arrays,
+    opportunity_from_arrays,
+)
+from src.data.preprocess import (
+    add_tou_features,
+    add_weather_features,
+    add_zone_proximity_features,
+    compute_opportunity_for_savings,
+    engineer_features,
+    merge_occupancy_hvac_arrays,
+    prepare_occupancy_forecast_dataset,
+    zone_distance_matrix,
+)
 
 
 def test_feature_alignment_no_future_leakage():
@@ -30,3 +47,163 @@ def test_feature_alignment_no_future_leakage():
     # lag(1) at index i must equal occupancy_count at i-1.
     assert features.loc[2, "occupancy_lag_1"] == features.loc[1, "occupancy_count"]
     assert features.loc[5, "occupancy_lag_4"] == features.loc[1, "occupancy_count"]
+
+
+def test_engineer_features_lags_do_not_cross_zones():
+    ts = pd.date_range("2025-01-01 00:00:00", periods=3, freq="15min")
+    df = pd.DataFrame(
+        {
+            "timestamp": list(ts) * 2,
+            "zone_id": ["A"] * 3 + ["B"] * 3,
+            "occupancy_count": [1, 2, 3, 10, 20, 30],
+        }
+    )
+
+    features = engineer_features(df, lag_periods=[1])
+    zone_b = features[features["zone_id"] == "B"].reset_index(drop=True)
+
+    assert pd.isna(zone_b.loc[0, "occupancy_count_lag_1"])
+    assert zone_b.loc[1, "occupancy_count_lag_1"] == 10
+    assert zone_b.loc[2, "occupancy_count_lag_1"] == 20
+
+
+def test_engineer_features_calendar_fields_match_dt_accessor():
+    ts = pd.Series(pd.date_range("2024-12-30 22:00:00", periods=200, freq="47min"))
+    features = engineer_features(pd.DataFrame({"timestamp": ts, "occupancy_count": 0}))
+
+    assert (features["hour"] == ts.dt.hour).all()
+    assert (features["day_of_week"] == ts.dt.dayofweek).all()
+    assert (features["month"] == ts.dt.month).all()
+    assert (features["is_weekend"] == ts.dt.dayofweek.isin([5, 6]).astype(int)).all()
+
+
+def test_add_weather_features_uses_latest_reading_within_tolerance():
+    df = pd.DataFrame(
+        {"timestamp": pd.to_datetime(["2025-01-01 00:45", "2025-01-01 00:15", "2025-01-01 03:30"])}
+    )
+    weather = pd.DataFrame(
+        {
+            "timestamp": pd.to_datetime(["2025-01-01 00:00", "2025-01-01 01:00"]),
+            "outside_temp": [60.0, 61.0],
+        }
+    )
+
+    out = add_weather_features(df, weather)
+
+    assert out["outside_temp"].iloc[:2].tolist() == [60.0, 60.0]
+    assert pd.isna(out.loc[2, "outside_temp"])
+
+
+def test_compute_opportunity_for_savings_flags_empty_zones_with_hvac_on():
+    df = pd.DataFrame(
+        {
+            "occupancy_count": [0, 3, 0, None],
+            "hvac_on": [True, True, False, True],
+            "energy_kwh": [1.5, 2.0, 4.0, 0.5],
+        }
+    )
+
+    out = compute_opportunity_for_savings(df)
+
+    assert out["is_opportunity"].tolist() == [True, False, False, True]
+    assert out["potential_energy_savings"].tolist() == [1.5, 0.0, 0.0, 0.5]
+    assert out.attrs["total_potential_energy_savings"] == 2.0
+
+
+def test_merge_occupancy_hvac_arrays_round_trips_and_feeds_kernel():
+    ts = pd.date_range("2025-01-01 00:00:00", periods=2, freq="15min")
+    occ = pd.DataFrame(
+        {"timestamp": list(ts) * 2, "zone_id": ["B", "B", "A", "A"], "occupancy_count": [0, 2, 0, 0]}
+    )
+    hvac = pd.DataFrame(
+        {
+            "timestamp": list(ts) * 2,
+            "zone_id": ["B", "B", "A", "A"],
+            "hvac_on": [True, True, False, True],
+            "energy_kwh": [1.0, 2.0, 3.0, 4.0],
+        }
+    )
+
+    arrays = merge_occupancy_hvac_arrays(occ, hvac)
+    frame = arrays.to_frame()
+
+    assert arrays.zone_id.dtype == np.int32
+    assert list(arrays.zone_codebook) == ["A", "B"]
+    assert arrays.energy.dtype == np.float32
+    assert set(frame["zone_id"]) == {"A", "B"}
+
+    mask, savings, total = opportunity_from_arrays(arrays)
+    assert mask.sum() == 2
+    assert total == 5.0
+
+    assert arrays.hvac_on_bits.nbytes == 1
+    assert frame["hvac_on"].dtype == bool
+    bits, packed_total = opportunity_bits_from_arrays(arrays)
+    assert np.array_equal(np.unpackbits(bits, count=len(arrays)).view(bool), mask)
+    assert packed_total == total
+
+
+def test_opportunity_kernel_matches_numpy_with_missing_values():
+    occ = np.array([0.0, np.nan, 1.0, 0.0, 0.0])
+    hvac_on = np.array([True, True, True, True, False])
+    energy = np.array([1.0, 2.0, 3.0, 4.0, np.nan])
+
+    mask, savings, total = opportunity(occ, hvac_on, energy)
+    ref_mask, ref_savings, ref_total = _opportunity_numpy(occ, hvac_on, energy)
+
+    assert np.array_equal(mask, ref_mask)
+    assert np.array_equal(savings, ref_savings)
+    assert total == ref_total == 5.0
+
+
+def test_add_tou_features_respects_day_of_week_windows():
+    tou = pd.DataFrame(
+        {
+            "start_hour": [0, 16, 0],
+            "end_hour": [16, 21, 24],
+            "rate_kwh": [0.125, 0.375, 0.0625],
+            "day_of_week": [None, None, 6],
+        }
+    )
+    df = pd.DataFrame(
+        {"timestamp": pd.to_datetime(["2025-01-04 17:00", "2025-01-05 17:00", "2025-01-06 02:00"])}
+    )
+
+    out = add_tou_features(df, tou)
+
+    # Saturday peak, Sunday flat override, Monday off-peak.
+    assert out["tou_rate"].tolist() == [0.375, 0.0625, 0.125]
+
+
+def test_add_tou_features_returns_exact_float64_rates():
+    tou = pd.DataFrame({"start_hour": [0, 12], "end_hour": [12, 24], "rate_kwh": [0.1, 0.3]})
+    df = pd.DataFrame({"timestamp": pd.to_datetime(["2025-01-06 02:00", "2025-01-06 13:00"])})
+
+    out = add_tou_features(df, tou)
+
+    assert out["tou_rate"].dtype == np.float64
+    assert out["tou_rate"].tolist() == [0.1, 0.3]
+
+
+def test_zone_distance_matrix_and_nearest_zone_feature():
+    metadata = pd.DataFrame(
+        {
+            "zone_id": ["A", "B", "C", "D"],
+            # A->B is 0.001 deg of latitude (~111 m); C is ~1.1 km east of A.
+            "latitude": [40.0, 40.001, 40.0, np.nan],
+            "longitude": [-86.0, -86.0, -85.987, -86.0],
+        }
+    )
+
+    zones, dist = zone_distance_matrix(metadata)
+
+    assert zones.tolist() == ["A", "B", "C"]
+    assert dist.dtype == np.float32
+    assert np.allclose(dist, dist.T)
+    assert dist[0, 1] == pytest.approx(0.1112, rel=1e-3)
+
+    df = pd.DataFrame({"zone_id": ["C", "A", "D"]})
+    out = add_zone_proximity_features(df, metadata)
+    assert out["nearest_zone_km"].iloc[0] == pytest.approx(min(dist[0, 2], dist[1, 2]))
+    assert out["nearest_zone_km"].iloc[1] == pytest.approx(dist[0, 1])
+    assert np.isnan(out["nearest_zone_km"].iloc[2])
@@ -1,6 +1,8 @@
+import numpy as np
 import pandas as pd
+import pytest
 
-from src.models.prophet_baseline import ProphetOccupancyModel
+from src.models.prophet_baseline import ProphetOccupancyModel, fit_all_zones
 
 
 def test_date_range_inference_returns_full_coverage():
@@ -51,3 +53,57 @@ def test_binary_conversion_definition_threshold():
     )
     metrics = model.evaluate(test_df)
     assert metrics["binary_accuracy"] == 1.0
+
+
+def test_statsforecast_backend_forecasts_past_training_end():
+    pytest.importorskip("statsforecast")
+    ds = pd.date_range("2025-01-01 00:00:00", periods=4 * 96, freq="15min")
+    train = pd.DataFrame({"ds": ds, "y": np.tile(np.r_[np.zeros(48), np.full(48, 5.0)], 4)})
+    model = ProphetOccupancyModel(zone_id="A", freq="15min", backend="statsforecast")
+    model.fit(train)
+
+    forecast = model.predict(periods=96, include_history=True)
+
+    assert model.backend == "statsforecast"
+    assert len(forecast) == len(train) + 96
+    future = forecast.iloc[len(train):]
+    assert future["pred_is_occupied"].tolist() == [False] * 48 + [True] * 48
+
+
+def test_statsforecast_backend_rejects_prophet_options():
+    with pytest.raises(ValueError, match="changepoint_prior_scale"):
+        ProphetOccupancyModel(backend="statsforecast", changepoint_prior_scale=0.1)
+
+    model = ProphetOccupancyModel(backend="statsforecast", n_jobs=2)
+    assert model.n_jobs == 2
+    assert model.prophet_kwargs == {}
+    # n_jobs is a model option, never forwarded to Prophet.
+    assert "n_jobs" not in ProphetOccupancyModel(n_jobs=2).prophet_kwargs
+
+
+def test_fit_all_zones_returns_one_fitted_model_per_zone():
+    ds = pd.date_range("2025-01-01 00:00:00", periods=96, freq="15min")
+    df = pd.concat(
+        [
+            pd.DataFrame({"zone_id": "A", "ds": ds, "y": 1.0}),
+            pd.DataFrame({"zone_id": "B", "ds": ds, "y": 3.0}),
+        ],
+        ignore_index=True,
+    )
+
+    models = fit_all_zones(df, freq="15min", n_jobs=2)
+
+    assert sorted(models) == ["A", "B"]
+    assert models["B"].zone_id == "B"
+    assert models["B"].predict(periods=4)["pred_occupancy_count"].tolist() == [3.0] * 4
+
+
+def test_fit_arrays_matches_dataframe_fit():
+    ds = pd.date_range("2025-01-01 00:00:00", periods=192, freq="15min")
+    y = np.tile(np.arange(4.0), 48)
+    shuffled = np.random.default_rng(0).permutation(len(ds))
+
+    from_arrays = ProphetOccupancyModel(freq="15min").fit_arrays(ds.to_numpy()[shuffled], y[shuffled])
+    from_frame = ProphetOccupancyModel(freq="15min").fit(pd.DataFrame({"ds": ds, "y": y}))
+
+    pd.testing.assert_frame_equal(from_arrays.predict(periods=8), from_frame.predict(periods=8))
@@ -0,0 +1,64 @@
+import dataclasses
+import re
+
+import numpy as np
+import pytest
+
+from src.viz.savings_report import (
+    SavingsSummary,
+    _pie_svg,
+    savings_summary_html,
+    write_savings_summary,
+)
+
+
+def test_summary_html_reads_both_optimizer_summary_schemas():
+    computed = {
+        "baseline_energy_kwh": 200.0,
+        "total_energy_savings": 50.0,
+        "energy_savings_pct": 25.0,
+        "setback_hours": 12.0,
+        "total_cost_savings": 7.5,
+    }
+    simulated = {"baseline_energy_kwh": 200.0, "energy_savings_kwh": 50.0, "cost_savings": 7.5}
+
+    for summary in (computed, simulated):
+        markup = savings_summary_html(summary)
+        assert "50.0 kWh" in markup and "$7.50" in markup
+        assert markup.count("<path") == 2  # saved vs. remaining
+
+
+def test_pie_slices_follow_breakdown_fractions():
+    svg = _pie_svg({"peak": 3.0, "off-peak": 1.0}, size=200)
+    coords = [tuple(map(float, m)) for m in re.findall(r"A [\d.]+ [\d.]+ 0 (\d) 1 ([\d.]+) ([\d.]+)", svg)]
+
+    # First slice spans 270 degrees from 12 o'clock, so it takes the large arc
+    # and ends at 9 o'clock; the second closes the circle back at the top.
+    assert coords[0][0] == 1 and coords[1][0] == 0
+    np.testing.assert_allclose(coords[0][1:], (10.0, 100.0), atol=0.01)
+    np.testing.assert_allclose(coords[1][1:], (100.0, 10.0), atol=0.01)
+    assert "<circle" in _pie_svg({"all": 1.0, "none": 0.0}, size=200)
+    assert _pie_svg({}, size=200) == ""
+
+
+def test_write_summary_html_and_png_requires_imgkit(tmp_path, monkeypatch):
+    path = write_savings_summary({"total_energy_savings": 1.0}, tmp_path / "summary.html")
+    assert "<!DOCTYPE html>" in path.read_text()
+
+    monkeypatch.setattr("src.viz.savings_report.imgkit", None)
+    with pytest.raises(ImportError):
+        write_savings_summary({"total_energy_savings": 1.0}, tmp_path / "summary.png")
+
+
+def test_savings_summary_is_frozen_slotted_and_adapts_dicts():
+    summary = SavingsSummary.from_dict(
+        {"total_energy_savings": 5.0, "baseline_energy_kwh": 20.0, "breakdown": {"peak": 4, "off": 1}}
+    )
+
+    assert summary == SavingsSummary(5.0, baseline_energy_kwh=20.0, breakdown=(("peak", 4.0), ("off", 1.0)))
+    assert not hasattr(summary, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        summary.energy_savings_kwh = 1.0
+    assert savings_summary_html(summary) == savings_summary_html(
+        {"total_energy_savings": 5.0, "baseline_energy_kwh": 20.0, "breakdown": {"peak": 4, "off": 1}}
+    )
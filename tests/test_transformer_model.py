@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.transformer_baseline import TransformerOccupancyModel
+
+torch = pytest.importorskip("torch")
+
+
+def _daily_pattern_df(days: int = 4) -> pd.DataFrame:
+    ts = pd.date_range("2025-01-01 00:00:00", periods=days * 96, freq="15min")
+    occ = np.where((ts.hour >= 8) & (ts.hour < 18), 5.0, 0.0)
+    return pd.DataFrame({"timestamp": ts, "occupancy_count": occ})
+
+
+def test_fit_records_train_and_val_loss():
+    model = TransformerOccupancyModel(seq_length=16, pred_length=8, d_model=16, n_heads=2, n_layers=1)
+    model.fit(_daily_pattern_df(), epochs=2, batch_size=16)
+
+    assert len(model.history) == 2
+    assert {"train_loss", "val_loss"}.issubset(model.history[-1])
+    assert np.isfinite(model.history[-1]["train_loss"])
+
+
+def test_predict_rolls_forward_past_pred_length():
+    df = _daily_pattern_df()
+    model = TransformerOccupancyModel(seq_length=16, pred_length=8, d_model=16, n_heads=2, n_layers=1)
+    model.fit(df, epochs=1, batch_size=16)
+
+    forecast = model.predict(df, horizon=20)
+
+    assert len(forecast) == 20
+    assert forecast["timestamp"].iloc[0] == df["timestamp"].iloc[-1] + pd.Timedelta("15min")
+    assert forecast["timestamp"].is_monotonic_increasing
+    assert (forecast["predicted_occupancy"] >= 0).all()
+
+
+def test_fit_arrays_names_exog_columns_for_predict():
+    df = _daily_pattern_df().assign(hour=lambda d: d["timestamp"].dt.hour.astype(float))
+    model = TransformerOccupancyModel(seq_length=16, pred_length=8, d_model=16, n_heads=2, n_layers=1)
+    model.fit_arrays(
+        df["timestamp"].to_numpy(),
+        df["occupancy_count"].to_numpy(),
+        df[["hour"]].to_numpy(),
+        epochs=1,
+        feature_cols=["hour"],
+    )
+
+    assert model.feature_cols == ["occupancy_count", "hour"]
+    assert len(model.predict(df, horizon=8)) == 8
+
+
+def test_fit_scales_on_training_rows_only():
+    y = np.concatenate([np.zeros(80), np.full(20, 100.0)]).astype(np.float32)
+    model = TransformerOccupancyModel(seq_length=8, pred_length=4, d_model=16, n_heads=2, n_layers=1)
+    model.fit_arrays(None, y, epochs=1, batch_size=16, val_split=0.25)
+
+    # 89 windows -> 22 validation, 67 training windows spanning rows [0, 78).
+    mean, std = model.scaler
+    np.testing.assert_allclose(mean, [0.0])
+    np.testing.assert_allclose(std, [1.0])